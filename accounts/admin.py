@@ -1,12 +1,12 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User
+from .models import User, RevokedToken
 
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
     list_display = ['email', 'username', 'subscription_plan', 'created_at', 'is_active']
     list_filter = ['subscription_plan', 'is_active', 'created_at']
-    search_fields = ['email', 'username']
+    search_fields = ['^email', '^username']
     ordering = ['-created_at']
     
     fieldsets = BaseUserAdmin.fieldsets + (
@@ -14,4 +14,11 @@ class UserAdmin(BaseUserAdmin):
             'fields': ('subscription_plan', 'subscription_expires', 'hardware_fingerprint', 
                       'max_clients', 'allowed_models')
         }),
-    )
\ No newline at end of file
+    )
+
+@admin.register(RevokedToken)
+class RevokedTokenAdmin(admin.ModelAdmin):
+    list_display = ['jti', 'revoked_at', 'expires_at']
+    search_fields = ['=jti']
+    readonly_fields = ['jti', 'revoked_at', 'expires_at']
+    ordering = ['-revoked_at']
\ No newline at end of file
@@ -0,0 +1,153 @@
+import threading
+import time
+from collections import OrderedDict
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+# Fields loaded into request.user; any other field is deferred and loaded on access
+CACHED_USER_FIELDS = {
+    'id', 'email', 'username', 'subscription_plan', 'subscription_expires',
+    'max_clients', 'allowed_models', 'is_active', 'is_staff', 'is_superuser', 'created_at',
+}
+
+def user_cache_key(user_id):
+    """Shared cache key of an authenticated user"""
+    return f'accounts:auth_user:{user_id}'
+
+def shared_cache_timeout():
+    """
+    AUTH_USER_CACHE_TIMEOUT, or 0 when the default cache is not shared.
+
+    A per-process cache cannot see invalidations made by other workers, so
+    it would serve stale users for the whole timeout.
+    """
+    if isinstance(caches['default'], (LocMemCache, DummyCache)):
+        return 0
+    return settings.AUTH_USER_CACHE_TIMEOUT
+
+class UserCache:
+    """Per-process LRU of user field values in front of the shared cache"""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def set(self, user_id, values):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + settings.AUTH_USER_CACHE_LOCAL_TIMEOUT, values)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > settings.AUTH_USER_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+        cache.delete(user_cache_key(user_id))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+user_cache = UserCache()
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that rebuilds request.user from cached field values.
+
+    Users are looked up in a per-process LRU (AUTH_USER_CACHE_LOCAL_TIMEOUT),
+    then the shared cache (AUTH_USER_CACHE_TIMEOUT, skipped unless the
+    default cache is shared between processes, e.g. Redis) and only then
+    the database. Saving or deleting a user clears this process's LRU and
+    the shared cache, so other processes keep a stale copy for at most the
+    local timeout.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Revocation compares the password hash, which is never cached
+            return super().get_user(validated_token)
+
+        user_id = self.get_user_id(validated_token)
+        return self.build_user(self.get_user_values(user_id))
+
+    async def aget_user(self, validated_token):
+        """Async get_user for async views"""
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return await sync_to_async(super().get_user)(validated_token)
+
+        user_id = self.get_user_id(validated_token)
+        values = user_cache.get(user_id)
+        if values is None:
+            values = await sync_to_async(self.get_user_values)(user_id)
+        return self.build_user(values)
+
+    def get_user_id(self, validated_token):
+        """Get the user id claim of a token"""
+        try:
+            return str(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+    def build_user(self, values):
+        """Build a user with deferred fields from cached values"""
+        if values is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+
+        User = get_user_model()
+        field_names = [
+            field.attname for field in User._meta.concrete_fields if field.attname in values
+        ]
+        user = User.from_db(DEFAULT_DB_ALIAS, field_names, [values[name] for name in field_names])
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        return user
+
+    def get_user_values(self, user_id):
+        """Get cached field values of a user, loading them on a miss"""
+        values = user_cache.get(user_id)
+        if values is not None:
+            return values
+
+        key = user_cache_key(user_id)
+        timeout = shared_cache_timeout()
+        if timeout:
+            values = cache.get(key)
+        if values is None:
+            User = get_user_model()
+            fields = [
+                field.attname for field in User._meta.concrete_fields
+                if field.name in CACHED_USER_FIELDS
+            ]
+            try:
+                values = User.objects.filter(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                ).values(*fields).first()
+            except (ValueError, TypeError):
+                values = None
+            if values is None:
+                return None
+            if timeout:
+                cache.set(key, values, timeout)
+
+        user_cache.set(user_id, values)
+        return values
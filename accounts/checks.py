@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.checks import Error, Tags, register
+
+PASSWORD_HASHER_CHOICES = ('pbkdf2', 'argon2', 'bcrypt')
+
+@register(Tags.security)
+def check_password_hasher(app_configs, **kwargs):
+    """
+    PASSWORD_HASHER must name a configured hasher whose library imports.
+
+    An unknown value would otherwise silently keep pbkdf2, and a missing
+    argon2-cffi or bcrypt would only fail at the first login.
+    """
+    if settings.PASSWORD_HASHER.lower() not in PASSWORD_HASHER_CHOICES:
+        return [Error(
+            f'PASSWORD_HASHER {settings.PASSWORD_HASHER!r} is not a known hasher.',
+            hint=f'Use one of: {", ".join(PASSWORD_HASHER_CHOICES)}',
+            id='accounts.E001',
+        )]
+    hasher = get_hasher('default')
+    if hasher.library:
+        try:
+            hasher._load_library()
+        except ValueError as e:
+            return [Error(str(e), hint='Install it from requirements.txt.', id='accounts.E002')]
+    return []
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher, BCryptSHA256PasswordHasher, PBKDF2PasswordHasher
+)
+
+# Password hashers with their work factors taken from settings. They keep
+# Django's algorithm names, so existing hashes verify unchanged and are
+# rehashed with the configured cost on the next successful login.
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with PASSWORD_PBKDF2_ITERATIONS iterations"""
+    iterations = settings.PASSWORD_PBKDF2_ITERATIONS
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id with cost from PASSWORD_ARGON2_* settings (requires argon2-cffi)"""
+    time_cost = settings.PASSWORD_ARGON2_TIME_COST
+    memory_cost = settings.PASSWORD_ARGON2_MEMORY_COST
+    parallelism = settings.PASSWORD_ARGON2_PARALLELISM
+
+class TunedBCryptSHA256PasswordHasher(BCryptSHA256PasswordHasher):
+    """bcrypt over SHA-256 with PASSWORD_BCRYPT_ROUNDS rounds (requires bcrypt)"""
+    rounds = settings.PASSWORD_BCRYPT_ROUNDS
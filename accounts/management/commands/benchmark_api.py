@@ -0,0 +1,325 @@
+import asyncio
+import io
+import json
+import platform
+import os
+import re
+import secrets
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection, connections
+from django.db.backends.signals import connection_created
+from django.conf import settings
+from django.test import AsyncClient, Client, override_settings
+from django.test.utils import (
+    CaptureQueriesContext, setup_databases, setup_test_environment,
+    teardown_databases, teardown_test_environment
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+from licenses.audit import audit_writer
+from licenses.models import License
+from models_api.models import ModelFile, ModelDownload
+
+User = get_user_model()
+
+BENCHMARK_PASSWORD = 'benchmark-password'
+ENDPOINTS = ['login', 'validate_license', 'available_models', 'create_download_token', 'download_model']
+SERVER_TIMING_QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+def percentile(values, percent):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+class Command(BaseCommand):
+    help = 'Benchmark API endpoints against a freshly seeded test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help='Number of users (and licenses) to seed')
+        parser.add_argument('--downloads', type=int, default=1000, help='Number of ModelDownload rows to seed')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent client threads')
+        parser.add_argument(
+            '--endpoints',
+            default=','.join(ENDPOINTS),
+            help=f'Comma separated endpoints to run (default: {",".join(ENDPOINTS)})'
+        )
+        parser.add_argument('--output', help='Write results as JSON to this file')
+        parser.add_argument('--baseline', help='Compare results against a previous JSON output')
+        parser.add_argument('--keepdb', action='store_true', help='Keep the test database between runs')
+        parser.add_argument(
+            '--handler', choices=['wsgi', 'asgi'], default='wsgi',
+            help='Drive requests through the WSGI handler with threads or the ASGI handler with coroutines'
+        )
+        parser.add_argument(
+            '--conn-max-age', type=int, default=None,
+            help='Override CONN_MAX_AGE to compare persistent connections with connecting per request'
+        )
+        parser.add_argument(
+            '--throttle', action='store_true',
+            help='Keep login and register throttling on (all requests come from one IP)'
+        )
+
+    def handle(self, *args, **options):
+        """Seed a test database, drive the endpoints and report latency"""
+        if options['throttle']:
+            return self.run(options)
+        rates = settings.REST_FRAMEWORK.get('DEFAULT_THROTTLE_RATES', {})
+        with override_settings(REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {scope: None for scope in rates},
+        }):
+            return self.run(options)
+
+    def run(self, options):
+        """Run the benchmark with the given options"""
+        endpoints = [name.strip() for name in options['endpoints'].split(',') if name.strip()]
+        unknown = set(endpoints) - set(ENDPOINTS)
+        if unknown:
+            self.stderr.write(self.style.ERROR(f'Unknown endpoints: {", ".join(sorted(unknown))}'))
+            return
+
+        if connection.vendor == 'sqlite' and not connection.settings_dict['TEST'].get('NAME'):
+            # Shared in-memory SQLite fails concurrent writes instead of waiting
+            connection.settings_dict['TEST']['NAME'] = os.path.join(
+                tempfile.gettempdir(), 'tiktrue_benchmark.sqlite3'
+            )
+
+        if options['conn_max_age'] is not None:
+            # Threads open their own connections from these settings
+            connections.settings['default']['CONN_MAX_AGE'] = options['conn_max_age']
+            connection.settings_dict['CONN_MAX_AGE'] = options['conn_max_age']
+        conn_max_age = connections.settings['default']['CONN_MAX_AGE']
+        
+        self.connects = 0
+        self.connects_lock = threading.Lock()
+        connection_created.connect(self.count_connect)
+        
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options['keepdb'])
+        try:
+            self.stdout.write('Seeding benchmark data...')
+            self.seed(options['users'], options['downloads'])
+
+            if options['handler'] == 'asgi' and not settings.ASYNC_VIEWS:
+                self.stdout.write(self.style.WARNING(
+                    'ASYNC_VIEWS is off, sync views will run in threads under ASGI'
+                ))
+            
+            results = {}
+            for endpoint in endpoints:
+                if options['handler'] == 'asgi':
+                    results[endpoint] = asyncio.run(self.run_endpoint_async(
+                        endpoint, options['requests'], options['concurrency']
+                    ))
+                else:
+                    results[endpoint] = self.run_endpoint(
+                        endpoint, options['requests'], options['concurrency']
+                    )
+                self.report(endpoint, results[endpoint])
+        finally:
+            audit_writer.flush()
+            connection_created.disconnect(self.count_connect)
+            teardown_databases(old_config, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        output = {
+            'meta': {
+                'timestamp': datetime.now().isoformat(),
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'users': options['users'],
+                'downloads': options['downloads'],
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'handler': options['handler'],
+                'conn_max_age': conn_max_age,
+                'async_views': settings.ASYNC_VIEWS,
+            },
+            'results': results,
+        }
+
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                self.compare(json.load(f)['results'], results)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(output, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
+
+    def seed(self, user_count, download_count):
+        """Create users, licenses, models and download records in bulk"""
+        call_command('setup_models', stdout=io.StringIO())
+        self.models = list(ModelFile.objects.filter(is_active=True))
+
+        # Hash once, the password hasher would dominate seeding otherwise
+        password = make_password(BENCHMARK_PASSWORD)
+        users = User.objects.bulk_create([
+            User(email=f'bench{i}@example.com', username=f'bench{i}', password=password)
+            for i in range(user_count)
+        ], batch_size=1000)
+        self.users = list(User.objects.filter(email__startswith='bench').order_by('email'))
+
+        License.objects.bulk_create([
+            License(user=user, license_key=License().generate_license_key())
+            for user in self.users
+        ], batch_size=1000)
+
+        downloads = [
+            ModelDownload(
+                user=self.users[i % len(self.users)],
+                model=self.models[i % len(self.models)],
+                download_token=secrets.token_urlsafe(32),
+                ip_address='127.0.0.1',
+            )
+            for i in range(download_count)
+        ]
+        ModelDownload.objects.bulk_create(downloads, batch_size=1000)
+        self.tokens = {}
+        for download in downloads:
+            self.tokens.setdefault(download.user_id, []).append(download.download_token)
+
+        self.access_tokens = {
+            user.id: str(RefreshToken.for_user(user).access_token) for user in self.users
+        }
+        self.stdout.write(
+            f'Seeded {len(users)} users, {len(self.users)} licenses, {download_count} downloads'
+        )
+
+    def count_connect(self, sender, connection, **kwargs):
+        """Count new database connections from any thread"""
+        with self.connects_lock:
+            self.connects += 1
+
+    def request_args(self, endpoint, index):
+        """Get method, path and keyword arguments of one request for an endpoint"""
+        user = self.users[index % len(self.users)]
+        headers = {'Authorization': f'Bearer {self.access_tokens[user.id]}'}
+        if endpoint == 'login':
+            return 'post', '/api/v1/auth/login/', {
+                'data': {'email': user.email, 'password': BENCHMARK_PASSWORD},
+                'content_type': 'application/json',
+            }
+        if endpoint == 'validate_license':
+            return 'get', '/api/v1/license/validate/', {
+                'data': {'hardware_fingerprint': 'benchmark'}, 'headers': headers
+            }
+        if endpoint == 'available_models':
+            return 'get', '/api/v1/models/available/', {'headers': headers}
+        if endpoint == 'create_download_token':
+            model = self.models[index % len(self.models)]
+            return 'post', f'/api/v1/models/{model.id}/download/', {'headers': headers}
+        tokens = self.tokens.get(user.id) or ['missing']
+        token = tokens[index % len(tokens)]
+        return 'get', f'/api/v1/models/download/{token}/', {'headers': headers}
+
+    def timed_request(self, endpoint, index):
+        """Run one request, measuring latency and query count"""
+        method, path, kwargs = self.request_args(endpoint, index)
+        client = Client(raise_request_exception=False)
+        # The test client skips the request_started and request_finished
+        # connection handling of a real server, so do it here; connecting
+        # happens lazily on the first query and is part of the latency
+        close_old_connections()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = getattr(client, method)(path, secure=True, **kwargs)
+            elapsed = time.perf_counter() - start
+        close_old_connections()
+        return elapsed, len(queries), response.status_code
+
+    async def timed_request_async(self, endpoint, index):
+        """Run one request through the ASGI handler, measuring latency and query count"""
+        method, path, kwargs = self.request_args(endpoint, index)
+        client = AsyncClient(raise_request_exception=False)
+        start = time.perf_counter()
+        response = await getattr(client, method)(path, secure=True, **kwargs)
+        elapsed = time.perf_counter() - start
+        # Async ORM queries run in worker threads, so count them from the
+        # Server-Timing header of RequestMetricsMiddleware
+        match = SERVER_TIMING_QUERIES_RE.search(response.get('Server-Timing', ''))
+        return elapsed, int(match.group(1)) if match else 0, response.status_code
+
+    def run_endpoint(self, endpoint, request_count, concurrency):
+        """Drive an endpoint concurrently with threads and summarize the samples"""
+        # Warm up caches and lazy imports outside the measurement
+        self.timed_request(endpoint, 0)
+
+        self.connects = 0
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(executor.map(
+                lambda index: self.timed_request(endpoint, index), range(request_count)
+            ))
+        return self.summarize(samples, time.perf_counter() - start)
+
+    async def run_endpoint_async(self, endpoint, request_count, concurrency):
+        """Drive an endpoint concurrently with coroutines and summarize the samples"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(index):
+            async with semaphore:
+                return await self.timed_request_async(endpoint, index)
+
+        await self.timed_request_async(endpoint, 0)
+
+        self.connects = 0
+        start = time.perf_counter()
+        samples = await asyncio.gather(*(run(index) for index in range(request_count)))
+        return self.summarize(samples, time.perf_counter() - start)
+
+    def summarize(self, samples, wall_time):
+        """Compute latency percentiles, throughput and query counts of samples"""
+        request_count = len(samples)
+        latencies = [elapsed * 1000 for elapsed, _, _ in samples]
+        statuses = {}
+        for _, _, status_code in samples:
+            statuses[str(status_code)] = statuses.get(str(status_code), 0) + 1
+        return {
+            'requests': request_count,
+            'errors': sum(1 for _, _, status_code in samples if status_code >= 400),
+            'statuses': statuses,
+            'requests_per_second': round(request_count / wall_time, 2),
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'queries_per_request': round(sum(count for _, count, _ in samples) / request_count, 2),
+            'connects_per_request': round(self.connects / request_count, 2),
+        }
+
+    def report(self, endpoint, result):
+        """Print one endpoint's results"""
+        self.stdout.write(
+            f'{endpoint:<24} {result["requests_per_second"]:>9.1f} req/s  '
+            f'p50 {result["p50_ms"]:>8.2f}ms  p95 {result["p95_ms"]:>8.2f}ms  '
+            f'p99 {result["p99_ms"]:>8.2f}ms  {result["queries_per_request"]:>5.1f} queries  '
+            f'{result["connects_per_request"]:>4.2f} connects  {result["errors"]} errors'
+        )
+
+    def compare(self, baseline, results):
+        """Print relative change against a baseline run"""
+        self.stdout.write('\nChange against baseline:')
+        for endpoint, result in results.items():
+            if endpoint not in baseline:
+                continue
+            changes = []
+            for metric in [
+                'requests_per_second', 'p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request', 'connects_per_request'
+            ]:
+                before = baseline[endpoint].get(metric)
+                if before:
+                    changes.append(f'{metric} {(result[metric] - before) / before * 100:+.1f}%')
+            self.stdout.write(f'{endpoint:<24} ' + '  '.join(changes))
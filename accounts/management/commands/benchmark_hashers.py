@@ -0,0 +1,54 @@
+import os
+import time
+from django.contrib.auth.hashers import get_hasher, get_hashers
+from django.core.management.base import BaseCommand
+
+class Command(BaseCommand):
+    help = 'Measure password verifications per second per core for each configured hasher'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Verifications timed per hasher')
+        parser.add_argument(
+            '--target-ms', type=float, default=None,
+            help='Suggest the cost for PASSWORD_PBKDF2_ITERATIONS to take this long per login'
+        )
+
+    def handle(self, *args, **options):
+        """Time check_password for every hasher in PASSWORD_HASHERS"""
+        cores = os.cpu_count() or 1
+        preferred = get_hasher('default').algorithm
+        self.stdout.write(f'{cores} cores, preferred hasher {preferred}\n')
+
+        for hasher in get_hashers():
+            try:
+                encoded = hasher.encode('benchmark-password', hasher.salt())
+            except ValueError as e:
+                # Library for this hasher is not installed
+                self.stdout.write(self.style.WARNING(f'  {hasher.algorithm:<20} skipped: {e}'))
+                continue
+
+            start = time.perf_counter()
+            for _ in range(options['iterations']):
+                hasher.verify('benchmark-password', encoded)
+            elapsed = (time.perf_counter() - start) / options['iterations']
+
+            marker = '*' if hasher.algorithm == preferred else ' '
+            self.stdout.write(
+                f'{marker} {hasher.algorithm:<20} {elapsed * 1000:>8.1f}ms per login  '
+                f'{1 / elapsed:>8.1f} logins/s per core  {cores / elapsed:>9.1f} logins/s on {cores} cores  '
+                f'{self.cost(hasher)}'
+            )
+
+            if options['target_ms'] and hasher.algorithm == 'pbkdf2_sha256':
+                suggested = int(hasher.iterations * options['target_ms'] / (elapsed * 1000))
+                self.stdout.write(f'  PASSWORD_PBKDF2_ITERATIONS={suggested} for ~{options["target_ms"]}ms')
+
+    def cost(self, hasher):
+        """Describe the work factor of a hasher"""
+        if hasattr(hasher, 'iterations'):
+            return f'iterations={hasher.iterations}'
+        if hasattr(hasher, 'time_cost'):
+            return f'time_cost={hasher.time_cost} memory_cost={hasher.memory_cost} parallelism={hasher.parallelism}'
+        if hasattr(hasher, 'rounds'):
+            return f'rounds={hasher.rounds}'
+        return ''
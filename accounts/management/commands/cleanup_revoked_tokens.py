@@ -0,0 +1,27 @@
+import time
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from accounts.models import RevokedToken
+
+class Command(BaseCommand):
+    help = 'Delete revoked refresh tokens that have expired anyway'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Tokens deleted per statement')
+        parser.add_argument('--sleep', type=float, default=0, help='Seconds to pause between batches')
+
+    def handle(self, *args, **options):
+        """Delete expired revocations in batches"""
+        expired = RevokedToken.objects.filter(expires_at__lte=timezone.now())
+        total = 0
+        
+        while True:
+            jtis = list(expired.order_by('expires_at').values_list('pk', flat=True)[:options['batch_size']])
+            if not jtis:
+                break
+            RevokedToken.objects.filter(pk__in=jtis).delete()
+            total += len(jtis)
+            if options['sleep']:
+                time.sleep(options['sleep'])
+        
+        self.stdout.write(self.style.SUCCESS(f'Deleted {total} expired revoked tokens'))
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-16 19:22
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+import tiktrue_backend.migration_operations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        tiktrue_backend.migration_operations.AddIndexConcurrently(
+            model_name='user',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('email', models.TextField())), name='text_pattern_ops'), name='user_email_upper_like_idx'),
+            postgres_only=True,
+        ),
+    ]
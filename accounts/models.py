@@ -1,5 +1,7 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Cast, Upper
 import uuid
 
 class User(AbstractUser):
@@ -28,6 +30,15 @@ class User(AbstractUser):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
     
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Serves case-insensitive prefix search on emails in the admin
+            models.Index(
+                OpClass(Upper(Cast('email', models.TextField())), name='text_pattern_ops'),
+                name='user_email_upper_like_idx'
+            ),
+        ]
+    
     def __str__(self):
         return self.email
     
@@ -37,4 +48,14 @@ class User(AbstractUser):
         return [
             'llama3_1_8b_fp16',
             'mistral_7b_int4',
-        ]
\ No newline at end of file
+        ]
+
+class RevokedToken(models.Model):
+    """Refresh token revoked by logout or rotation, kept until it expires"""
+    
+    jti = models.CharField(max_length=64, primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    def __str__(self):
+        return self.jti
\ No newline at end of file
@@ -0,0 +1,99 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from .models import RevokedToken
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings"""
+
+    def __init__(self, capacity, error_rate):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def positions(self, value):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:], 'big') | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, value):
+        for position in self.positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(value))
+
+class RevocationSet:
+    """
+    Per-process view of revoked token ids.
+
+    A Bloom filter answers most lookups without the database; only filter
+    hits are confirmed against RevokedToken. Revocations from other workers
+    are picked up every TOKEN_REVOCATION_SYNC_SECONDS, and the filter is
+    rebuilt every TOKEN_REVOCATION_REBUILD_SECONDS to drop expired tokens.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filter = None
+        self._synced_at = None
+        self._next_sync = 0
+        self._next_rebuild = 0
+
+    def is_revoked(self, jti):
+        self.sync()
+        if jti not in self._filter:
+            return False
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def add(self, jti):
+        self.sync()
+        self._filter.add(jti)
+
+    def sync(self):
+        """Load revocations recorded since the last sync, or rebuild when due"""
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        with self._lock:
+            if now < self._next_sync:
+                return
+            started = timezone.now()
+            if now >= self._next_rebuild or self._filter is None:
+                bloom = BloomFilter(
+                    settings.TOKEN_REVOCATION_BLOOM_CAPACITY, settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE
+                )
+                jtis = RevokedToken.objects.filter(expires_at__gt=started).values_list('jti', flat=True)
+                self._next_rebuild = now + settings.TOKEN_REVOCATION_REBUILD_SECONDS
+            else:
+                bloom = self._filter
+                # Overlap the previous sync so rows committed late are not missed
+                jtis = RevokedToken.objects.filter(
+                    revoked_at__gte=self._synced_at - timedelta(seconds=settings.TOKEN_REVOCATION_SYNC_OVERLAP)
+                ).values_list('jti', flat=True)
+            for jti in jtis.iterator():
+                bloom.add(jti)
+            self._filter = bloom
+            self._synced_at = started
+            self._next_sync = now + settings.TOKEN_REVOCATION_SYNC_SECONDS
+
+revocation_set = RevocationSet()
+
+def revoke_token(token):
+    """Revoke a refresh token until it expires"""
+    jti = token[api_settings.JTI_CLAIM]
+    RevokedToken.objects.bulk_create([
+        RevokedToken(jti=jti, expires_at=datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc))
+    ], ignore_conflicts=True)
+    revocation_set.add(jti)
+
+def is_token_revoked(token):
+    """Check whether a refresh token has been revoked"""
+    return revocation_set.is_revoked(token[api_settings.JTI_CLAIM])
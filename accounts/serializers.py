@@ -1,6 +1,11 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer as BaseTokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from tiktrue_backend.serializers import datetime_field
 from .models import User
+from .revocation import is_token_revoked, revoke_token
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8)
@@ -53,4 +58,37 @@ class UserProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
     
     def get_allowed_models(self, obj):
-        return obj.get_allowed_models()
\ No newline at end of file
+        return obj.get_allowed_models()
+
+def user_profile_data(user):
+    """Serialize a user exactly like UserProfileSerializer, without its field setup"""
+    return {
+        'id': str(user.id),
+        'email': user.email,
+        'username': user.username,
+        'subscription_plan': user.subscription_plan,
+        'subscription_expires': datetime_field.to_representation(user.subscription_expires),
+        'max_clients': user.max_clients,
+        'allowed_models': user.get_allowed_models(),
+        'created_at': datetime_field.to_representation(user.created_at)
+    }
+
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """Refresh serializer that rejects revoked tokens and revokes rotated ones"""
+    
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if is_token_revoked(refresh):
+            raise InvalidToken('Token is blacklisted')
+        
+        data = {'access': str(refresh.access_token)}
+        
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                revoke_token(refresh)
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        
+        return data
\ No newline at end of file
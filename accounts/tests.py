@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+from .models import User
+from .throttling import BUCKET_STORES, LoginEmailThrottle, LoginIPThrottle
+
+class ThrottleKeyTests(APITestCase):
+    """Login throttles key on the trusted client address and the normalized email"""
+    
+    def setUp(self):
+        cache.clear()
+        BUCKET_STORES['local']._buckets.clear()
+        self.factory = APIRequestFactory()
+    
+    def ip_key(self, **headers):
+        request = Request(self.factory.post('/', REMOTE_ADDR='10.0.0.1', **headers))
+        return LoginIPThrottle().get_cache_key(request, None)
+    
+    @override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1})
+    def test_ip_key_ignores_client_supplied_forwarded_for(self):
+        # With one trusted proxy only the address it appended counts
+        key = self.ip_key(HTTP_X_FORWARDED_FOR='203.0.113.7')
+        self.assertIn('203.0.113.7', key)
+        self.assertEqual(self.ip_key(HTTP_X_FORWARDED_FOR='198.51.100.1, 203.0.113.7'), key)
+    
+    def test_email_key(self):
+        def email_key(data):
+            request = Request(self.factory.post('/', data, format='json'), parsers=[JSONParser()])
+            return LoginEmailThrottle().get_cache_key(request, None)
+        
+        self.assertEqual(email_key({'email': ' User@Example.com '}), email_key({'email': 'user@example.com'}))
+        self.assertIsNone(email_key({'email': ''}))
+        self.assertIsNone(email_key([1, 2]))
+    
+    @override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {'login_ip': '100/min', 'login_email': '2/min'},
+    })
+    def test_login_is_throttled_per_email(self):
+        url = reverse('login')
+        data = {'email': 'user@example.com', 'password': 'wrong'}
+        statuses = [self.client.post(url, data, format='json', secure=True).status_code for _ in range(3)]
+        self.assertEqual(statuses, [400, 400, 429])
+        
+        # Another email has its own bucket
+        data['email'] = 'other@example.com'
+        self.assertEqual(self.client.post(url, data, format='json', secure=True).status_code, 400)
+
+class RefreshRevocationTests(APITestCase):
+    """Rotated and logged out refresh tokens cannot be used again"""
+    
+    def setUp(self):
+        cache.clear()
+        BUCKET_STORES['local']._buckets.clear()
+        User.objects.create_user(email='user@example.com', username='user', password='password123')
+        response = self.client.post(
+            reverse('login'), {'email': 'user@example.com', 'password': 'password123'}, format='json', secure=True
+        )
+        self.tokens = response.json()['tokens']
+    
+    def refresh(self, token):
+        return self.client.post(reverse('token_refresh'), {'refresh': token}, format='json', secure=True)
+    
+    def test_rotated_token_is_revoked(self):
+        response = self.refresh(self.tokens['refresh'])
+        self.assertEqual(response.status_code, 200)
+        rotated = response.json()['refresh']
+        self.assertNotEqual(rotated, self.tokens['refresh'])
+        
+        self.assertEqual(self.refresh(self.tokens['refresh']).status_code, 401)
+        self.assertEqual(self.refresh(rotated).status_code, 200)
+    
+    def test_logout_revokes_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.tokens["access"]}')
+        response = self.client.post(
+            reverse('logout'), {'refresh_token': self.tokens['refresh']}, format='json', secure=True
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.refresh(self.tokens['refresh']).status_code, 401)
@@ -0,0 +1,110 @@
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+class LocalBucketStore:
+    """Token buckets kept in process memory, bounded in size"""
+
+    def __init__(self, max_size=100000):
+        self.max_size = max_size
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, refill_rate, now):
+        """Take one token, returning seconds to wait (0 when allowed)"""
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens, wait = refill_and_take(tokens, updated, capacity, refill_rate, now)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_size:
+                self._buckets.popitem(last=False)
+            return wait
+
+class CacheBucketStore:
+    """
+    Token buckets kept in the shared cache so limits hold across workers.
+
+    Reads and writes are not atomic, so concurrent requests for the same key
+    may occasionally both get the last token.
+    """
+
+    def take(self, key, capacity, refill_rate, now):
+        """Take one token, returning seconds to wait (0 when allowed)"""
+        tokens, updated = cache.get(key, (capacity, now))
+        tokens, wait = refill_and_take(tokens, updated, capacity, refill_rate, now)
+        cache.set(key, (tokens, now), int(capacity / refill_rate) + 1)
+        return wait
+
+def refill_and_take(tokens, updated, capacity, refill_rate, now):
+    """Refill a bucket for the elapsed time and take a token if one is left"""
+    tokens = min(capacity, tokens + (now - updated) * refill_rate)
+    if tokens >= 1:
+        return tokens - 1, 0
+    return tokens, (1 - tokens) / refill_rate
+
+BUCKET_STORES = {
+    'local': LocalBucketStore(),
+    'cache': CacheBucketStore(),
+}
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Throttle with a token bucket per key instead of a request history.
+
+    The rate 'N/period' allows bursts of N requests, refilled evenly over the
+    period. Buckets live in process memory or the shared cache depending on
+    THROTTLE_BACKEND. Returning no key skips throttling.
+    """
+    def get_rate(self):
+        # Read rates on each instantiation so settings overrides apply
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        store = BUCKET_STORES[settings.THROTTLE_BACKEND]
+        self.wait_time = store.take(
+            key, self.num_requests, self.num_requests / self.duration, self.timer()
+        )
+        return self.wait_time == 0
+
+    def wait(self):
+        return self.wait_time
+
+class IPThrottle(TokenBucketThrottle):
+    """
+    Token bucket per client IP address.
+
+    The address comes from DRF's get_ident, which takes the X-Forwarded-For
+    entry added by the right-most of NUM_PROXIES trusted proxies, so clients
+    cannot pick a fresh bucket by sending their own header.
+    """
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+class EmailThrottle(TokenBucketThrottle):
+    """Token bucket per email address in the request body"""
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not isinstance(email, str) or not email:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': email.strip().lower()}
+
+class LoginIPThrottle(IPThrottle):
+    scope = 'login_ip'
+
+class LoginEmailThrottle(EmailThrottle):
+    scope = 'login_email'
+
+class RegisterIPThrottle(IPThrottle):
+    scope = 'register_ip'
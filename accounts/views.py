@@ -1,13 +1,16 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from .models import User
-from .serializers import UserRegistrationSerializer, UserLoginSerializer, UserProfileSerializer
+from .serializers import UserRegistrationSerializer, UserLoginSerializer, user_profile_data
+from .revocation import revoke_token
+from .throttling import LoginEmailThrottle, LoginIPThrottle, RegisterIPThrottle
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([RegisterIPThrottle])
 def register(request):
     """User registration endpoint"""
     serializer = UserRegistrationSerializer(data=request.data)
@@ -16,7 +19,7 @@ def register(request):
         refresh = RefreshToken.for_user(user)
         return Response({
             'message': 'User registered successfully',
-            'user': UserProfileSerializer(user).data,
+            'user': user_profile_data(user),
             'tokens': {
                 'refresh': str(refresh),
                 'access': str(refresh.access_token),
@@ -26,6 +29,7 @@ def register(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([LoginIPThrottle, LoginEmailThrottle])
 def login(request):
     """User login endpoint for desktop application"""
     serializer = UserLoginSerializer(data=request.data)
@@ -41,7 +45,7 @@ def login(request):
         
         return Response({
             'message': 'Login successful',
-            'user': UserProfileSerializer(user).data,
+            'user': user_profile_data(user),
             'tokens': {
                 'refresh': str(refresh),
                 'access': str(refresh.access_token),
@@ -53,18 +57,16 @@ def login(request):
 @permission_classes([IsAuthenticated])
 def profile(request):
     """Get user profile information"""
-    serializer = UserProfileSerializer(request.user)
-    return Response(serializer.data)
+    return Response(user_profile_data(request.user))
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def logout(request):
-    """Logout user by blacklisting refresh token"""
+    """Logout user by revoking refresh token"""
     try:
         refresh_token = request.data.get('refresh_token')
         if refresh_token:
-            token = RefreshToken(refresh_token)
-            token.blacklist()
+            revoke_token(RefreshToken(refresh_token))
         return Response({'message': 'Logout successful'})
     except Exception as e:
         return Response({'error': 'Invalid token'}, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
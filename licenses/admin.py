@@ -1,18 +1,34 @@
 from django.contrib import admin
-from .models import License, LicenseValidation
+from tiktrue_backend.changelists import LargeTableAdminMixin
+from .models import License, LicenseValidation, LicenseValidationDaily
 
 @admin.register(License)
 class LicenseAdmin(admin.ModelAdmin):
     list_display = ['user', 'license_key', 'is_active', 'usage_count', 'created_at']
     list_filter = ['is_active', 'hardware_bound', 'created_at']
-    search_fields = ['user__email', 'license_key']
-    readonly_fields = ['license_key', 'created_at', 'last_validated']
+    list_select_related = ['user']
+    autocomplete_fields = ['user']
+    # Prefix searches are served by upper(...) text_pattern_ops indexes
+    search_fields = ['^user__email', '^license_key']
+    readonly_fields = ['license_key', 'created_at', 'last_validated', 'revoked_at']
     ordering = ['-created_at']
 
 @admin.register(LicenseValidation)
-class LicenseValidationAdmin(admin.ModelAdmin):
+class LicenseValidationAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ['license', 'hardware_fingerprint', 'ip_address', 'is_successful', 'validated_at']
     list_filter = ['is_successful', 'validated_at']
-    search_fields = ['license__user__email', 'hardware_fingerprint', 'ip_address']
+    list_select_related = ['license__user']
+    autocomplete_fields = ['license']
+    exact_search_fields = ['ip_address', 'hardware_fingerprint']
+    search_fields = ['^license__user__email', '^license__license_key']
     readonly_fields = ['validated_at']
-    ordering = ['-validated_at']
\ No newline at end of file
+    ordering = ['-validated_at']
+
+@admin.register(LicenseValidationDaily)
+class LicenseValidationDailyAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ['license', 'date', 'total_count', 'successful_count']
+    list_filter = ['date']
+    list_select_related = ['license__user']
+    autocomplete_fields = ['license']
+    search_fields = ['^license__user__email', '^license__license_key']
+    ordering = ['-date']
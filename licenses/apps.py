@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class LicensesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'licenses'
\ No newline at end of file
+    name = 'licenses'
+
+    def ready(self):
+        from . import checks  # noqa: F401
\ No newline at end of file
@@ -0,0 +1,42 @@
+import jwt
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+
+def create_license_assertion(license_obj, user, hardware_fingerprint):
+    """
+    Create a signed license assertion the desktop app can verify offline.
+
+    The assertion is a compact JWT signed with LICENSE_ASSERTION_ALGORITHM
+    (EdDSA with an Ed25519 private key by default) and expires after
+    LICENSE_ASSERTION_LIFETIME or when the license does.
+    Returns (token, expires_at).
+    """
+    key = settings.LICENSE_ASSERTION_SIGNING_KEY
+    if not key:
+        raise ImproperlyConfigured('LICENSE_ASSERTION_SIGNING_KEY is required for offline license assertions')
+    if key == settings.SECRET_KEY or settings.LICENSE_ASSERTION_ALGORITHM.upper().startswith('HS'):
+        raise ImproperlyConfigured('Offline license assertions need a dedicated asymmetric signing key')
+    
+    now = timezone.now()
+    expires_at = now + settings.LICENSE_ASSERTION_LIFETIME
+    if license_obj.expires_at and license_obj.expires_at < expires_at:
+        expires_at = license_obj.expires_at
+    
+    payload = {
+        'iss': 'tiktrue',
+        'sub': str(user.id),
+        'lid': str(license_obj.id),
+        'license_key': license_obj.license_key,
+        'hardware_fingerprint': hardware_fingerprint,
+        'plan': user.subscription_plan,
+        'max_clients': user.max_clients,
+        'allowed_models': user.get_allowed_models(),
+        'iat': int(now.timestamp()),
+        'exp': int(expires_at.timestamp()),
+    }
+    try:
+        token = jwt.encode(payload, key, algorithm=settings.LICENSE_ASSERTION_ALGORITHM)
+    except (jwt.exceptions.InvalidKeyError, NotImplementedError, ValueError, TypeError) as e:
+        raise ImproperlyConfigured(f'Invalid LICENSE_ASSERTION_SIGNING_KEY: {e}') from e
+    return token, expires_at
@@ -0,0 +1,32 @@
+from asgiref.sync import sync_to_async
+from tiktrue_backend.async_api import async_api_view, json_response
+from .models import License
+from .audit import record_usage, record_validation
+from .views import get_client_ip, validation_result
+
+@async_api_view(['GET'])
+async def validate_license(request):
+    """Validate user's license for desktop application"""
+    user = request.user
+    hardware_fingerprint = request.GET.get('hardware_fingerprint', '')
+    
+    license_obj, created = await License.objects.aget_or_create(
+        user=user,
+        defaults={
+            'is_active': True,
+            'expires_at': None,  # MVP: no expiration
+        }
+    )
+    
+    # Buffered audit writes only queue in memory, unbuffered ones hit the database
+    await sync_to_async(record_validation)(
+        license=license_obj,
+        hardware_fingerprint=hardware_fingerprint,
+        ip_address=get_client_ip(request),
+        user_agent=request.META.get('HTTP_USER_AGENT', ''),
+        is_successful=license_obj.is_valid()
+    )
+    await sync_to_async(record_usage)(license_obj)
+    
+    data, status_code = validation_result(request, license_obj, user, hardware_fingerprint)
+    return json_response(data, status=status_code)
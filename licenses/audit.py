@@ -0,0 +1,133 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+from .models import License, LicenseValidation
+
+logger = logging.getLogger(__name__)
+
+class AuditWriter:
+    """
+    Buffer license validation events and write them in batches.
+
+    Events are flushed by a background thread every
+    LICENSE_AUDIT_BATCH_SIZE events or LICENSE_AUDIT_FLUSH_INTERVAL_MS,
+    and once more when the worker exits. At most LICENSE_AUDIT_MAX_PENDING
+    events are held in memory; when the buffer is full the caller flushes
+    synchronously, which bounds how many events a crashed worker can lose.
+
+    License usage increments can be aggregated the same way and applied
+    as one UPDATE per distinct increment.
+    """
+    
+    def __init__(self):
+        self._pending = []
+        self._usage = Counter()
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        atexit.register(self.flush)
+    
+    def record(self, validation):
+        """Queue an unsaved LicenseValidation for writing"""
+        self._ensure_thread()
+        with self._condition:
+            self._pending.append(validation)
+            pending = len(self._pending)
+            if pending >= settings.LICENSE_AUDIT_BATCH_SIZE:
+                self._condition.notify()
+        if pending >= settings.LICENSE_AUDIT_MAX_PENDING:
+            self.flush()
+    
+    def record_usage(self, license_id):
+        """Queue a usage count increment for a license"""
+        self._ensure_thread()
+        with self._condition:
+            self._usage[license_id] += 1
+    
+    def flush(self):
+        """Write all pending events and usage increments"""
+        with self._flush_lock:
+            with self._condition:
+                events, self._pending = self._pending, []
+                usage, self._usage = self._usage, Counter()
+            if events:
+                try:
+                    LicenseValidation.objects.bulk_create(events)
+                except Exception:
+                    logger.exception('Failed to write %d license validation events', len(events))
+            if usage:
+                try:
+                    self._apply_usage(usage)
+                except Exception:
+                    logger.exception('Failed to update usage of %d licenses', len(usage))
+    
+    def _apply_usage(self, usage):
+        by_increment = defaultdict(list)
+        for license_id, increment in usage.items():
+            by_increment[increment].append(license_id)
+        now = timezone.now()
+        for increment, license_ids in by_increment.items():
+            License.objects.filter(pk__in=license_ids).update(
+                usage_count=F('usage_count') + increment,
+                last_validated=now
+            )
+    
+    def _ensure_thread(self):
+        # Start the flusher lazily so forked workers each get their own
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._condition:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='license-audit-writer', daemon=True)
+            self._thread.start()
+    
+    def _run(self):
+        interval = settings.LICENSE_AUDIT_FLUSH_INTERVAL_MS / 1000
+        while True:
+            deadline = time.monotonic() + interval
+            with self._condition:
+                while len(self._pending) < settings.LICENSE_AUDIT_BATCH_SIZE:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+            close_old_connections()
+            self.flush()
+
+audit_writer = AuditWriter()
+
+def record_validation(**fields):
+    """Log a license validation attempt, buffered when enabled"""
+    validation = LicenseValidation(**fields)
+    if settings.LICENSE_AUDIT_BUFFERED:
+        audit_writer.record(validation)
+    else:
+        validation.save()
+
+def record_usage(license_obj):
+    """
+    Increment license usage count atomically, aggregated when enabled.
+
+    license_obj is updated to match the row without re-reading it. Buffered
+    increments are written with the flush time, a moment later.
+    """
+    now = timezone.now()
+    if settings.LICENSE_USAGE_BUFFERED:
+        audit_writer.record_usage(license_obj.pk)
+    else:
+        License.objects.filter(pk=license_obj.pk).update(
+            usage_count=F('usage_count') + 1,
+            last_validated=now
+        )
+    license_obj.usage_count += 1
+    license_obj.last_validated = now
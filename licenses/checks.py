@@ -0,0 +1,51 @@
+import jwt
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+@register(Tags.security)
+def check_license_assertion_key(app_configs, **kwargs):
+    """
+    Check the key used to sign offline license assertions.
+
+    Offline validation is optional: without a usable key the rest of the API
+    works and ?offline=1 requests get a 503, so those cases are warnings.
+    Reusing SECRET_KEY is an error, as the desktop app would need it to
+    verify assertions.
+    """
+    algorithm = settings.LICENSE_ASSERTION_ALGORITHM
+    key = settings.LICENSE_ASSERTION_SIGNING_KEY
+    if not key:
+        return [Warning(
+            'LICENSE_ASSERTION_SIGNING_KEY is not set; offline license validation is disabled.',
+            hint='Generate one with: openssl genpkey -algorithm ed25519',
+            id='licenses.W001',
+        )]
+    if key == settings.SECRET_KEY:
+        return [Error(
+            'LICENSE_ASSERTION_SIGNING_KEY is the same as SECRET_KEY.',
+            hint='Use a dedicated Ed25519 private key.',
+            id='licenses.E001',
+        )]
+    if algorithm.upper().startswith('HS'):
+        return [Warning(
+            f'LICENSE_ASSERTION_ALGORITHM {algorithm} is symmetric; offline license validation is disabled.',
+            hint='Clients would need the signing key to verify assertions. Use EdDSA.',
+            id='licenses.W002',
+        )]
+    try:
+        prepared = jwt.get_algorithm_by_name(algorithm).prepare_key(key)
+    except NotImplementedError:
+        return [Warning(
+            f'LICENSE_ASSERTION_ALGORITHM {algorithm} is not available.',
+            hint='Install cryptography from requirements.txt.',
+            id='licenses.W003',
+        )]
+    except (jwt.exceptions.InvalidKeyError, ValueError, TypeError) as e:
+        return [Warning(f'LICENSE_ASSERTION_SIGNING_KEY is not a valid {algorithm} key: {e}', id='licenses.W004')]
+    if not hasattr(prepared, 'sign'):
+        return [Warning(
+            'LICENSE_ASSERTION_SIGNING_KEY is a public key.',
+            hint='Set the private key; clients get the public key.',
+            id='licenses.W005',
+        )]
+    return []
@@ -0,0 +1,143 @@
+import os
+import tempfile
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+)
+from licenses.models import License, LicenseValidation
+from models_api.models import ModelDownload
+from accounts.management.commands.benchmark_api import Command as BenchmarkApi
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    help = 'Seed large audit tables and show the query plans of hot lookups'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--licenses', type=int, default=1000, help='Number of licenses to seed')
+        parser.add_argument('--validations', type=int, default=10_000_000, help='LicenseValidation rows to seed')
+        parser.add_argument('--downloads', type=int, default=1_000_000, help='ModelDownload rows to seed')
+        parser.add_argument('--repeat', type=int, default=100, help='Times each lookup is timed')
+        parser.add_argument('--keepdb', action='store_true', help='Keep the seeded test database between runs')
+
+    def handle(self, *args, **options):
+        """Seed a test database, then explain and time the indexed lookups"""
+        if connection.vendor == 'sqlite' and not connection.settings_dict['TEST'].get('NAME'):
+            connection.settings_dict['TEST']['NAME'] = os.path.join(
+                tempfile.gettempdir(), 'tiktrue_benchmark_indexes.sqlite3'
+            )
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options['keepdb'])
+        try:
+            if not LicenseValidation.objects.exists():
+                self.seed(options['licenses'], options['validations'], options['downloads'])
+            self.explain_lookups(options['repeat'])
+        finally:
+            teardown_databases(old_config, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+    def sequence_insert(self, count, source_table, insert, select):
+        """
+        Insert count rows generated by the database itself.
+
+        Each generated row seq.i is joined to row number seq.i modulo the
+        size of source_table, exposed as src.id.
+        """
+        numbered = (
+            f'src AS (SELECT id, ROW_NUMBER() OVER (ORDER BY id) - 1 AS n FROM {source_table}), '
+            f'src_count AS (SELECT COUNT(*) AS total FROM {source_table})'
+        )
+        if connection.vendor == 'postgresql':
+            sql = (
+                f'WITH {numbered} {insert} {select} '
+                'FROM generate_series(1, %s) AS seq(i) CROSS JOIN src_count '
+                'JOIN src ON src.n = seq.i %% src_count.total'
+            )
+        else:
+            sql = (
+                'WITH RECURSIVE seq(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM seq WHERE i < %s), '
+                f'{numbered} {insert} {select} '
+                'FROM seq CROSS JOIN src_count JOIN src ON src.n = seq.i %% src_count.total'
+            )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [count])
+
+    def seed(self, license_count, validation_count, download_count):
+        """Generate rows in SQL so millions of rows seed in reasonable time"""
+        api = BenchmarkApi(stdout=self.stdout, stderr=self.stderr)
+        api.seed(license_count, 0)
+
+        ttl = settings.MODEL_DOWNLOAD_TOKEN_TTL
+        if connection.vendor == 'postgresql':
+            timestamp = "NOW() - seq.i * INTERVAL '1 second'"
+            expires = f"NOW() + ({ttl} - seq.i) * INTERVAL '1 second'"
+            new_uuid = 'md5(seq.i::text)::uuid'
+            model_id = str(api.models[0].id)
+        else:
+            timestamp = "strftime('%%Y-%%m-%%d %%H:%%M:%%f', 'now', '-' || seq.i || ' seconds')"
+            expires = f"strftime('%%Y-%%m-%%d %%H:%%M:%%f', 'now', ({ttl} - seq.i) || ' seconds')"
+            new_uuid = 'lower(hex(randomblob(16)))'
+            model_id = api.models[0].id.hex
+
+        start = time.perf_counter()
+        self.sequence_insert(
+            validation_count,
+            License._meta.db_table,
+            f'INSERT INTO {LicenseValidation._meta.db_table} '
+            '(license_id, hardware_fingerprint, ip_address, user_agent, validated_at, is_successful)',
+            f"SELECT src.id, 'benchmark', '127.0.0.1', '', {timestamp}, TRUE"
+        )
+        self.stdout.write(f'Seeded {validation_count} validations in {time.perf_counter() - start:.1f}s')
+
+        start = time.perf_counter()
+        self.sequence_insert(
+            download_count,
+            User._meta.db_table,
+            f'INSERT INTO {ModelDownload._meta.db_table} '
+            '(id, user_id, model_id, download_token, ip_address, user_agent, is_completed, started_at, expires_at)',
+            # Most historical downloads are completed, like in production; tokens
+            # expire MODEL_DOWNLOAD_TOKEN_TTL after they started
+            f"SELECT {new_uuid}, src.id, '{model_id}', 'token-' || seq.i, '127.0.0.1', '', "
+            f"seq.i %% 10 != 0, {timestamp}, {expires}"
+        )
+        self.stdout.write(f'Seeded {download_count} downloads in {time.perf_counter() - start:.1f}s')
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def explain_lookups(self, repeat):
+        """Print plan, index usage and mean latency of each hot lookup"""
+        now = timezone.now()
+        license_obj = License.objects.order_by('id').first()
+        active = (
+            ModelDownload.objects.filter(is_completed=False, expires_at__gt=now).order_by('started_at').first()
+            or ModelDownload.objects.filter(is_completed=False).order_by('started_at').first()
+        )
+
+        lookups = {
+            'recent validations for license': LicenseValidation.objects.filter(
+                license=license_obj
+            ).order_by('-validated_at')[:20],
+            # Same lookup as get_download_record
+            'active download token': ModelDownload.objects.filter(
+                download_token=active.download_token, user_id=active.user_id, is_completed=False,
+                expires_at__gt=now
+            ),
+        }
+        for name, queryset in lookups.items():
+            plan = queryset.explain()
+            uses_index = 'INDEX' in plan.upper()
+            start = time.perf_counter()
+            for _ in range(repeat):
+                list(queryset.all())
+            elapsed = (time.perf_counter() - start) / repeat * 1000
+
+            style = self.style.SUCCESS if uses_index else self.style.ERROR
+            self.stdout.write(style(f'\n{name}: {"index" if uses_index else "NO INDEX"}, {elapsed:.3f}ms'))
+            self.stdout.write(plan)
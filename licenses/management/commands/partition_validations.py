@@ -0,0 +1,148 @@
+from datetime import date, timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from licenses.models import LicenseValidation, LicenseValidationDaily
+
+TABLE = LicenseValidation._meta.db_table
+DAILY_TABLE = LicenseValidationDaily._meta.db_table
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+def next_month(value):
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+def partition_name(month):
+    return f'{TABLE}_p{month.year}_{month.month:02d}'
+
+class Command(BaseCommand):
+    help = 'Manage monthly PostgreSQL partitions of the license validation log'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--convert',
+            action='store_true',
+            help='Convert the table into a partitioned table (one-off, locks the table while copying)'
+        )
+        parser.add_argument('--months-ahead', type=int, default=3, help='Future monthly partitions to create')
+        parser.add_argument(
+            '--drop-expired',
+            action='store_true',
+            help='Roll up and drop partitions older than the retention window'
+        )
+        parser.add_argument('--days', type=int, default=settings.AUDIT_RETENTION_DAYS, help='Retention in days')
+
+    def handle(self, *args, **options):
+        """Convert, extend and expire validation log partitions"""
+        if connection.vendor != 'postgresql':
+            raise CommandError('Partitioning is only supported on PostgreSQL')
+
+        if options['convert']:
+            self.convert(options['months_ahead'])
+        elif not self.is_partitioned():
+            raise CommandError(f'{TABLE} is not partitioned yet, run with --convert first')
+
+        self.create_partitions(month_start(timezone.now()), options['months_ahead'])
+
+        if options['drop_expired']:
+            cutoff = (timezone.now() - timedelta(days=options['days'])).date()
+            self.drop_expired(cutoff)
+
+    def is_partitioned(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass', [TABLE])
+            return cursor.fetchone() is not None
+
+    def create_partitions(self, first_month, months_ahead):
+        """Create monthly partitions from first_month up to months_ahead from now"""
+        last_month = month_start(timezone.now())
+        for _ in range(months_ahead):
+            last_month = next_month(last_month)
+
+        month = first_month
+        with connection.cursor() as cursor:
+            while month <= last_month:
+                cursor.execute(
+                    f'CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {TABLE} '
+                    'FOR VALUES FROM (%s) TO (%s)',
+                    [month.isoformat(), next_month(month).isoformat()]
+                )
+                month = next_month(month)
+        self.stdout.write(self.style.SUCCESS(f'Partitions exist through {last_month:%Y-%m}'))
+
+    @transaction.atomic
+    def convert(self, months_ahead):
+        """Recreate the table as a partitioned table and copy existing rows"""
+        if self.is_partitioned():
+            self.stdout.write(self.style.WARNING(f'{TABLE} is already partitioned'))
+            return
+
+        legacy = f'{TABLE}_legacy'
+        with connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {legacy}')
+            cursor.execute(
+                f'CREATE TABLE {TABLE} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING IDENTITY) '
+                'PARTITION BY RANGE (validated_at)'
+            )
+            # Partitioned primary keys must include the partition key; the
+            # legacy table still owns the original constraint name
+            cursor.execute(
+                f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_part_pkey PRIMARY KEY (id, validated_at)'
+            )
+            cursor.execute(f'CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT')
+            cursor.execute(f'SELECT MIN(validated_at) FROM {legacy}')
+            oldest = cursor.fetchone()[0] or timezone.now()
+
+        self.create_partitions(month_start(oldest), months_ahead)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'INSERT INTO {TABLE} SELECT * FROM {legacy}')
+            cursor.execute(f'DROP TABLE {legacy}')
+            cursor.execute(
+                f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_license_id_fk FOREIGN KEY (license_id) '
+                'REFERENCES licenses_license (id) DEFERRABLE INITIALLY DEFERRED'
+            )
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), COALESCE(MAX(id), 1)) FROM {TABLE}"
+            )
+        # Recreate every index declared on the model, so none are lost when
+        # indexes are added later; the legacy table held the same names
+        with connection.schema_editor() as schema_editor:
+            for index in LicenseValidation._meta.indexes:
+                schema_editor.add_index(LicenseValidation, index)
+        self.stdout.write(self.style.SUCCESS(f'Converted {TABLE} to monthly partitions'))
+
+    def drop_expired(self, cutoff):
+        """Roll up whole partitions that ended before cutoff, then drop them"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT child.relname FROM pg_inherits '
+                'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+                'WHERE pg_inherits.inhparent = %s::regclass ORDER BY child.relname',
+                [TABLE]
+            )
+            partitions = [row[0] for row in cursor.fetchall()]
+
+        for name in partitions:
+            suffix = name[len(TABLE) + 2:]
+            if not name.startswith(f'{TABLE}_p') or len(suffix) != 7:
+                continue
+            month = date(int(suffix[:4]), int(suffix[5:]), 1)
+            if next_month(month) > cutoff:
+                continue
+
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    f'INSERT INTO {DAILY_TABLE} (license_id, date, total_count, successful_count) '
+                    'SELECT license_id, (validated_at AT TIME ZONE %s)::date, COUNT(*), '
+                    'COUNT(*) FILTER (WHERE is_successful) '
+                    f'FROM {name} GROUP BY 1, 2 '
+                    'ON CONFLICT (license_id, date) DO UPDATE SET '
+                    f'total_count = {DAILY_TABLE}.total_count + EXCLUDED.total_count, '
+                    f'successful_count = {DAILY_TABLE}.successful_count + EXCLUDED.successful_count',
+                    [settings.TIME_ZONE]
+                )
+                cursor.execute(f'DROP TABLE {name}')
+            self.stdout.write(self.style.SUCCESS(f'Rolled up and dropped {name}'))
@@ -0,0 +1,63 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+from django.utils import timezone
+from licenses.models import LicenseValidation, LicenseValidationDaily
+from models_api.models import ModelDownload, ModelDownloadDaily
+from tiktrue_backend.retention import rollup_batches
+
+class Command(BaseCommand):
+    help = 'Roll up audit rows older than the retention window into daily tables and delete them'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.AUDIT_RETENTION_DAYS,
+            help='Keep raw rows for this many days'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.AUDIT_RETENTION_BATCH_SIZE,
+            help='Rows rolled up and deleted per transaction'
+        )
+        parser.add_argument('--sleep', type=float, default=0, help='Seconds to pause between batches')
+
+    def handle(self, *args, **options):
+        """Roll up license validations and model downloads"""
+        # Cut at local midnight so only complete days are rolled up
+        cutoff = timezone.localtime(timezone.now() - timedelta(days=options['days'])).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        self.stdout.write(f'Rolling up audit rows before {cutoff}')
+
+        count = rollup_batches(
+            LicenseValidation.objects.filter(validated_at__lt=cutoff),
+            'validated_at',
+            'license_id',
+            LicenseValidationDaily,
+            {
+                'total_count': Count('id'),
+                'successful_count': Count('id', filter=Q(is_successful=True)),
+            },
+            options['batch_size'],
+            options['sleep'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Rolled up {count} license validations'))
+
+        count = rollup_batches(
+            ModelDownload.objects.filter(started_at__lt=cutoff),
+            'started_at',
+            'model_id',
+            ModelDownloadDaily,
+            {
+                'total_count': Count('id'),
+                # Expired tokens are closed by sweep_download_tokens without completed_at
+                'completed_count': Count('id', filter=Q(is_completed=True, completed_at__isnull=False)),
+            },
+            options['batch_size'],
+            options['sleep'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Rolled up {count} model downloads'))
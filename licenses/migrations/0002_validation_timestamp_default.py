@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-16 19:04
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='licensevalidation',
+            name='validated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
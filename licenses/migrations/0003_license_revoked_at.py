@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-16 19:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0002_validation_timestamp_default'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='license',
+            name='revoked_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
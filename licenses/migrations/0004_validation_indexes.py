@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-16 19:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+import tiktrue_backend.migration_operations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('licenses', '0003_license_revoked_at'),
+    ]
+
+    operations = [
+        tiktrue_backend.migration_operations.AddIndexConcurrently(
+            model_name='licensevalidation',
+            index=models.Index(fields=['license', '-validated_at'], name='licensevalidation_recent_idx'),
+        ),
+        migrations.AlterField(
+            model_name='licensevalidation',
+            name='license',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='validations', to='licenses.license'),
+        ),
+    ]
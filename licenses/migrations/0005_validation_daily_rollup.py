@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-16 19:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+import tiktrue_backend.migration_operations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('licenses', '0004_validation_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LicenseValidationDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('total_count', models.IntegerField(default=0)),
+                ('successful_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-date'],
+            },
+        ),
+        tiktrue_backend.migration_operations.AddIndexConcurrently(
+            model_name='licensevalidation',
+            index=models.Index(fields=['validated_at'], name='licensevalidation_time_idx'),
+        ),
+        migrations.AddField(
+            model_name='licensevalidationdaily',
+            name='license',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_validations', to='licenses.license'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='licensevalidationdaily',
+            unique_together={('license', 'date')},
+        ),
+    ]
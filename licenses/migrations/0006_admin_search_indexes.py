@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-16 19:22
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+import tiktrue_backend.migration_operations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('licenses', '0005_validation_daily_rollup'),
+    ]
+
+    operations = [
+        tiktrue_backend.migration_operations.AddIndexConcurrently(
+            model_name='license',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(django.db.models.functions.comparison.Cast('license_key', models.TextField())), name='text_pattern_ops'), name='license_key_upper_like_idx'),
+            postgres_only=True,
+        ),
+        tiktrue_backend.migration_operations.AddIndexConcurrently(
+            model_name='licensevalidation',
+            index=models.Index(fields=['ip_address'], name='licensevalidation_ip_idx'),
+        ),
+        tiktrue_backend.migration_operations.AddIndexConcurrently(
+            model_name='licensevalidation',
+            index=models.Index(fields=['hardware_fingerprint'], name='licensevalidation_hw_idx'),
+        ),
+    ]
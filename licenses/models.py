@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models.functions import Cast, Upper
+from django.contrib.postgres.indexes import OpClass
 from django.conf import settings
 from django.utils import timezone
 import uuid
@@ -16,11 +18,26 @@ class License(models.Model):
     is_active = models.BooleanField(default=True)
     usage_count = models.IntegerField(default=0)
     last_validated = models.DateTimeField(auto_now=True)
+    revoked_at = models.DateTimeField(null=True, blank=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        indexes = [
+            # Serves case-insensitive prefix search on license keys in the admin
+            models.Index(
+                OpClass(Upper(Cast('license_key', models.TextField())), name='text_pattern_ops'),
+                name='license_key_upper_like_idx'
+            ),
+        ]
+    
     def save(self, *args, **kwargs):
         if not self.license_key:
             self.license_key = self.generate_license_key()
+        # Track deactivation so offline assertions can be revoked
+        if self.is_active:
+            self.revoked_at = None
+        elif self.revoked_at is None:
+            self.revoked_at = timezone.now()
         super().save(*args, **kwargs)
     
     def generate_license_key(self):
@@ -33,9 +50,14 @@ class License(models.Model):
     
     def is_valid(self):
         """Check if license is valid"""
-        if not self.is_active:
+        return self.check_valid(self.is_active, self.expires_at)
+    
+    @staticmethod
+    def check_valid(is_active, expires_at):
+        """Check license validity from field values, also usable on values rows"""
+        if not is_active:
             return False
-        if self.expires_at and self.expires_at < timezone.now():
+        if expires_at and expires_at < timezone.now():
             return False
         return True
     
@@ -45,15 +67,38 @@ class License(models.Model):
 class LicenseValidation(models.Model):
     """Track license validation attempts"""
     
-    license = models.ForeignKey(License, on_delete=models.CASCADE, related_name='validations')
+    # Indexed through licensevalidation_recent_idx
+    license = models.ForeignKey(License, on_delete=models.CASCADE, related_name='validations', db_index=False)
     hardware_fingerprint = models.CharField(max_length=256)
     ip_address = models.GenericIPAddressField()
     user_agent = models.TextField(blank=True)
-    validated_at = models.DateTimeField(auto_now_add=True)
+    validated_at = models.DateTimeField(default=timezone.now)
     is_successful = models.BooleanField(default=True)
     
     class Meta:
         ordering = ['-validated_at']
+        indexes = [
+            models.Index(fields=['license', '-validated_at'], name='licensevalidation_recent_idx'),
+            models.Index(fields=['validated_at'], name='licensevalidation_time_idx'),
+            # Exact admin searches by IP address and hardware fingerprint
+            models.Index(fields=['ip_address'], name='licensevalidation_ip_idx'),
+            models.Index(fields=['hardware_fingerprint'], name='licensevalidation_hw_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.license.license_key[:16]}... - {self.validated_at}"
+
+class LicenseValidationDaily(models.Model):
+    """Daily rollup of license validations past the retention window"""
+    
+    license = models.ForeignKey(License, on_delete=models.CASCADE, related_name='daily_validations')
+    date = models.DateField()
+    total_count = models.IntegerField(default=0)
+    successful_count = models.IntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['license', 'date']
+        ordering = ['-date']
     
     def __str__(self):
-        return f"{self.license.license_key[:16]}... - {self.validated_at}"
\ No newline at end of file
+        return f"{self.license.license_key[:16]}... - {self.date}"
\ No newline at end of file
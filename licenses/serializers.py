@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from tiktrue_backend.serializers import datetime_field
 from .models import License, LicenseValidation
 
 class LicenseSerializer(serializers.ModelSerializer):
@@ -23,4 +24,24 @@ class LicenseValidationSerializer(serializers.ModelSerializer):
             'id', 'hardware_fingerprint', 'ip_address', 'user_agent',
             'validated_at', 'is_successful'
         ]
-        read_only_fields = ['id', 'validated_at']
\ No newline at end of file
+        read_only_fields = ['id', 'validated_at']
+
+LICENSE_FIELDS = [field for field in LicenseSerializer.Meta.fields if field != 'is_valid']
+
+def license_row(license_obj):
+    """Values row of a License instance"""
+    return {field: getattr(license_obj, field) for field in LICENSE_FIELDS}
+
+def license_data(row):
+    """Serialize a License values row exactly like LicenseSerializer"""
+    return {
+        'id': str(row['id']),
+        'license_key': row['license_key'],
+        'hardware_bound': row['hardware_bound'],
+        'expires_at': datetime_field.to_representation(row['expires_at']),
+        'is_active': row['is_active'],
+        'usage_count': row['usage_count'],
+        'last_validated': datetime_field.to_representation(row['last_validated']),
+        'created_at': datetime_field.to_representation(row['created_at']),
+        'is_valid': License.check_valid(row['is_active'], row['expires_at'])
+    }
\ No newline at end of file
@@ -1,7 +1,12 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
+
+# Under ASGI license validation runs as a coroutine
+validate_views = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
-    path('validate/', views.validate_license, name='validate_license'),
+    path('validate/', validate_views.validate_license, name='validate_license'),
     path('info/', views.license_info, name='license_info'),
+    path('revoked/', views.revoked_licenses, name='revoked_licenses'),
 ]
\ No newline at end of file
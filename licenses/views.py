@@ -2,9 +2,16 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
 from django.utils import timezone
-from .models import License, LicenseValidation
-from .serializers import LicenseSerializer
+from .models import License
+from .serializers import LICENSE_FIELDS, license_data, license_row
+from .assertions import create_license_assertion
+from .audit import record_usage, record_validation
+
+REVOCATION_LIST_CACHE_KEY = 'licenses:revoked'
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -23,7 +30,7 @@ def validate_license(request):
     )
     
     # Log validation attempt
-    LicenseValidation.objects.create(
+    record_validation(
         license=license_obj,
         hardware_fingerprint=hardware_fingerprint,
         ip_address=get_client_ip(request),
@@ -32,24 +39,39 @@ def validate_license(request):
     )
     
     # Update usage count
-    license_obj.usage_count += 1
-    license_obj.save()
+    record_usage(license_obj)
     
+    data, status_code = validation_result(request, license_obj, user, hardware_fingerprint)
+    return Response(data, status=status_code)
+
+def validation_result(request, license_obj, user, hardware_fingerprint):
+    """Build the validate_license response body and status"""
     if license_obj.is_valid():
-        return Response({
+        data = {
             'valid': True,
-            'license': LicenseSerializer(license_obj).data,
+            'license': license_data(license_row(license_obj)),
             'user_info': {
                 'subscription_plan': user.subscription_plan,
                 'max_clients': user.max_clients,
                 'allowed_models': user.get_allowed_models(),
             }
-        })
+        }
+        # Signed assertion lets the client skip validation until it expires
+        if request.GET.get('offline', '').lower() in ('1', 'true'):
+            try:
+                assertion, expires_at = create_license_assertion(license_obj, user, hardware_fingerprint)
+            except ImproperlyConfigured:
+                return {
+                    'error': 'Offline license validation is not available'
+                }, status.HTTP_503_SERVICE_UNAVAILABLE
+            data['license_assertion'] = assertion
+            data['assertion_expires_at'] = expires_at
+        return data, status.HTTP_200_OK
     else:
-        return Response({
+        return {
             'valid': False,
             'message': 'License is not valid or has expired'
-        }, status=status.HTTP_403_FORBIDDEN)
+        }, status.HTTP_403_FORBIDDEN
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -58,9 +80,9 @@ def license_info(request):
     user = request.user
     
     try:
-        license_obj = License.objects.get(user=user)
+        row = License.objects.values(*LICENSE_FIELDS).get(user=user)
         return Response({
-            'license': LicenseSerializer(license_obj).data,
+            'license': license_data(row),
             'user_info': {
                 'email': user.email,
                 'subscription_plan': user.subscription_plan,
@@ -74,6 +96,25 @@ def license_info(request):
             'error': 'No license found for user'
         }, status=status.HTTP_404_NOT_FOUND)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def revoked_licenses(request):
+    """List licenses revoked while their offline assertions may still be valid"""
+    cached = cache.get(REVOCATION_LIST_CACHE_KEY)
+    if cached is None:
+        since = timezone.now() - settings.LICENSE_ASSERTION_LIFETIME
+        cached = {
+            'revoked': [
+                str(license_id)
+                for license_id in License.objects.filter(
+                    revoked_at__gte=since
+                ).values_list('id', flat=True)
+            ],
+            'generated_at': timezone.now(),
+        }
+        cache.set(REVOCATION_LIST_CACHE_KEY, cached, settings.LICENSE_REVOCATION_LIST_CACHE_TIMEOUT)
+    return Response(cached)
+
 def get_client_ip(request):
     """Get client IP address from request"""
     x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import ModelFile, ModelAccess, ModelDownload
+from tiktrue_backend.changelists import LargeTableAdminMixin
+from .models import ModelFile, ModelAccess, ModelDownload, ModelBlock, ModelDownloadDaily
 
 @admin.register(ModelFile)
 class ModelFileAdmin(admin.ModelAdmin):
@@ -9,15 +10,38 @@ class ModelFileAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at', 'updated_at']
 
 @admin.register(ModelAccess)
-class ModelAccessAdmin(admin.ModelAdmin):
+class ModelAccessAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ['user', 'model', 'access_granted', 'download_count', 'last_download']
     list_filter = ['access_granted', 'created_at', 'last_download']
-    search_fields = ['user__email', 'model__name']
+    list_select_related = ['user', 'model']
+    autocomplete_fields = ['user', 'model']
+    search_fields = ['^user__email', '^model__name']
     readonly_fields = ['created_at']
 
 @admin.register(ModelDownload)
-class ModelDownloadAdmin(admin.ModelAdmin):
+class ModelDownloadAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ['user', 'model', 'is_completed', 'started_at', 'completed_at']
     list_filter = ['is_completed', 'started_at']
-    search_fields = ['user__email', 'model__name', 'download_token']
-    readonly_fields = ['download_token', 'started_at', 'completed_at']
\ No newline at end of file
+    list_select_related = ['user', 'model']
+    autocomplete_fields = ['user', 'model']
+    exact_search_fields = ['download_token']
+    search_fields = ['^user__email', '^model__name']
+    readonly_fields = ['download_token', 'started_at', 'completed_at']
+
+@admin.register(ModelBlock)
+class ModelBlockAdmin(admin.ModelAdmin):
+    list_display = ['model', 'version', 'block_index', 'filename', 'size', 'sha256']
+    list_filter = ['model', 'version']
+    list_select_related = ['model']
+    autocomplete_fields = ['model']
+    search_fields = ['model__name', 'sha256']
+    readonly_fields = ['created_at', 'updated_at']
+    ordering = ['model', 'version', 'block_index']
+
+@admin.register(ModelDownloadDaily)
+class ModelDownloadDailyAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ['model', 'date', 'total_count', 'completed_count']
+    list_filter = ['model', 'date']
+    list_select_related = ['model']
+    autocomplete_fields = ['model']
+    ordering = ['-date']
@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class ModelsApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'models_api'
\ No newline at end of file
+    name = 'models_api'
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
\ No newline at end of file
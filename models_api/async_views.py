@@ -0,0 +1,68 @@
+from asgiref.sync import sync_to_async
+from rest_framework import status
+from django.utils import timezone
+from tiktrue_backend.async_api import async_api_view, json_response
+from .models import ModelDownload, ModelBlock
+from .files import ranged_file_response
+from .transfer import acquire_connection, release_connection, release_on_close
+from .views import block_file, manifest_data
+
+# Async versions of the download views, routed instead of the sync ones when
+# ASYNC_VIEWS is on and the project is served through asgi.py
+
+async def get_download_record(request, download_token):
+    """Get active download record for token, or an error response"""
+    try:
+        download_record = await ModelDownload.objects.select_related('model').aget(
+            download_token=download_token,
+            user=request.user,
+            is_completed=False,
+            expires_at__gt=timezone.now()
+        )
+    except ModelDownload.DoesNotExist:
+        return None, json_response(
+            {'error': 'Invalid or expired download token'}, status=status.HTTP_404_NOT_FOUND
+        )
+    
+    return download_record, None
+
+@async_api_view(['GET'])
+async def download_model(request, download_token):
+    """Download model using secure token"""
+    download_record, error = await get_download_record(request, download_token)
+    if error:
+        return error
+    
+    model = download_record.model
+    manifest = [block async for block in model.blocks.filter(version=model.version)]
+    return json_response(manifest_data(model, manifest, download_token))
+
+@async_api_view(['GET'])
+async def download_block(request, download_token, block_id):
+    """Stream a single model block without holding a thread while the client reads"""
+    download_record, error = await get_download_record(request, download_token)
+    if error:
+        return error
+    
+    model = download_record.model
+    if not 1 <= block_id <= model.block_count:
+        return json_response({'error': 'Block not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    block = await ModelBlock.objects.filter(
+        model=model, version=model.version, block_index=block_id
+    ).afirst()
+    
+    # Parallel ranged downloads are limited per token
+    slot = await sync_to_async(acquire_connection)(download_token)
+    if slot is None:
+        response = json_response(
+            {'error': 'Too many concurrent connections for this download'},
+            status=status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        response['Retry-After'] = '1'
+        return response
+    response = ranged_file_response(request, *block_file(model, block, block_id))
+    if response is None:
+        await sync_to_async(release_connection)(slot)
+        return json_response({'error': 'Block file not available'}, status=status.HTTP_404_NOT_FOUND)
+    return release_on_close(response, slot)
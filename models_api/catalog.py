@@ -0,0 +1,58 @@
+import hashlib
+import secrets
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.http import quote_etag
+from tiktrue_backend.renderers import FastJSONRenderer
+
+CATALOG_VERSION_KEY = 'models_api:catalog_version'
+
+def get_catalog_version():
+    """Get current catalog version, creating one if the cache has none"""
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, secrets.token_hex(8), None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+def bump_catalog_version():
+    """Invalidate all cached catalog responses"""
+    cache.set(CATALOG_VERSION_KEY, secrets.token_hex(8), None)
+
+def catalog_key(*parts):
+    """Build a cache key from parts, hashing lists of allowed models"""
+    return ':'.join(
+        hashlib.md5(','.join(sorted(part)).encode()).hexdigest() if isinstance(part, list) else str(part)
+        for part in parts
+    )
+
+def catalog_etag(version, key):
+    """ETag of a cached catalog response"""
+    return quote_etag(f'{version}-{hashlib.md5(key.encode()).hexdigest()}')
+
+def not_modified(request, etag):
+    """Check If-None-Match against a catalog ETag"""
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+    return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+
+def get_catalog_entry(version, key, build):
+    """
+    Get a cached catalog entry, building it on a miss.
+
+    build() returns (data, extra); data is rendered to JSON once and
+    stored with extra so later hits skip the ORM and serializers.
+    """
+    cache_key = f'models_api:catalog:{version}:{key}'
+    entry = cache.get(cache_key)
+    if entry is None:
+        data, extra = build()
+        entry = {'body': FastJSONRenderer().render(data), **extra}
+        cache.set(cache_key, entry, settings.MODEL_CATALOG_CACHE_TIMEOUT)
+    return entry
+
+def catalog_response(body, etag, status=200):
+    """Build a response from a pre-serialized JSON body"""
+    response = HttpResponse(body, status=status, content_type='application/json')
+    response['ETag'] = etag
+    return response
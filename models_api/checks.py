@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+@register(Tags.security)
+def check_url_signing_key(app_configs, **kwargs):
+    """
+    Check the HMAC key for signed block URLs.
+
+    Signed URLs are optional and rejected with a 503 while the key is unset.
+    The key may be shared with an edge proxy, so reusing SECRET_KEY is an
+    error.
+    """
+    key = settings.MODEL_URL_SIGNING_KEY
+    if not key:
+        return [Warning(
+            'MODEL_URL_SIGNING_KEY is not set; signed block URLs are disabled.',
+            hint='Generate one with: python -c "import secrets; print(secrets.token_urlsafe(50))"',
+            id='models_api.W001',
+        )]
+    if key == settings.SECRET_KEY:
+        return [Error(
+            'MODEL_URL_SIGNING_KEY is the same as SECRET_KEY.',
+            hint='Use a dedicated key; it is shared with proxies that validate signed URLs.',
+            id='models_api.E002',
+        )]
+    return []
@@ -0,0 +1,265 @@
+import asyncio
+import hashlib
+import os
+import re
+import shutil
+from pathlib import Path
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.encoding import escape_uri_path
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+BLOCK_RE = re.compile(r'^block_(\d+)\.onnx$')
+
+def model_dir(model):
+    """Get storage directory for a model"""
+    return Path(settings.MODEL_STORAGE_ROOT) / model.name
+
+def block_path(model, block_id):
+    """Get path of a model block file"""
+    return model_dir(model) / 'blocks' / f'block_{block_id}.onnx'
+
+def storage_file(storage_path):
+    """Resolve a storage path relative to MODEL_STORAGE_ROOT"""
+    return Path(settings.MODEL_STORAGE_ROOT) / storage_path
+
+def object_storage_path(sha256):
+    """Get content-addressed storage path for a file hash"""
+    return f'objects/{sha256[:2]}/{sha256}'
+
+def store_object(path, sha256):
+    """
+    Move a file into the content-addressed object store.
+
+    Files with the same hash are stored once, so a source whose content is
+    already stored is removed. Returns the storage path.
+    """
+    storage_path = object_storage_path(sha256)
+    target = storage_file(storage_path)
+    if target.exists():
+        os.remove(path)
+        return storage_path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f'{target.name}.tmp')
+    shutil.move(path, tmp)
+    os.replace(tmp, target)
+    return storage_path
+
+def find_block_files(model):
+    """List (block_index, path) pairs for block files present on disk"""
+    blocks_dir = model_dir(model) / 'blocks'
+    if not blocks_dir.is_dir():
+        return []
+    blocks = []
+    for path in blocks_dir.iterdir():
+        match = BLOCK_RE.match(path.name)
+        if match and path.is_file():
+            blocks.append((int(match.group(1)), path))
+    return sorted(blocks)
+
+def hash_file(path, chunk_size=None, segment_size=None):
+    """
+    Compute SHA-256 and size of a file, reading it in chunks.
+
+    With segment_size the SHA-256 of every segment_size byte range is
+    computed in the same pass. Returns (sha256, size, segment_hashes).
+    """
+    chunk_size = chunk_size or settings.MODEL_DOWNLOAD_CHUNK_SIZE
+    digest = hashlib.sha256()
+    size = 0
+    segment_hashes = []
+    segment = hashlib.sha256()
+    segment_remaining = segment_size
+    with open(path, 'rb') as f:
+        while True:
+            # Never read across a segment boundary
+            chunk = f.read(min(chunk_size, segment_remaining) if segment_size else chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+            size += len(chunk)
+            if segment_size:
+                segment.update(chunk)
+                segment_remaining -= len(chunk)
+                if segment_remaining == 0:
+                    segment_hashes.append(segment.hexdigest())
+                    segment = hashlib.sha256()
+                    segment_remaining = segment_size
+    if segment_size and segment_remaining < segment_size:
+        segment_hashes.append(segment.hexdigest())
+    return digest.hexdigest(), size, segment_hashes
+
+def tokenizer_path(model):
+    """Get path of a model tokenizer file"""
+    return model_dir(model) / 'tokenizer.json'
+
+def metadata_path(model):
+    """Get path of a model metadata file"""
+    return model_dir(model) / 'metadata.json'
+
+def file_etag(stat):
+    """Build a strong ETag from file modification time and size"""
+    return quote_etag(f'{int(stat.st_mtime):x}-{stat.st_size:x}')
+
+def parse_range_header(header, size):
+    """
+    Parse a single byte range against a file of the given size.
+
+    Returns (start, end) with inclusive end, None when the header should be
+    ignored and a full response sent, or False when the range cannot be
+    satisfied.
+    """
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if not match:
+        # Multiple ranges and unknown units are ignored
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            return False
+        return max(0, size - suffix), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        return False
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+def if_range_matches(request, etag, mtime):
+    """Check whether the If-Range validator still matches the file"""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        # Weak validators never match for ranges
+        return if_range == etag
+    last_modified = parse_http_date_safe(if_range)
+    return last_modified is not None and last_modified == int(mtime)
+
+def iter_file(path, start, length, chunk_size=None):
+    """Read a byte range of a file in fixed-size chunks"""
+    chunk_size = chunk_size or settings.MODEL_DOWNLOAD_CHUNK_SIZE
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+async def aiter_file(path, start, length, chunk_size=None):
+    """Read a byte range of a file in chunks without blocking the event loop"""
+    chunk_size = chunk_size or settings.MODEL_DOWNLOAD_CHUNK_SIZE
+    f = await asyncio.to_thread(open, path, 'rb')
+    try:
+        await asyncio.to_thread(f.seek, start)
+        remaining = length
+        while remaining > 0:
+            chunk = await asyncio.to_thread(f.read, min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+def offload_response(path, content_type):
+    """
+    Hand file delivery off to the fronting web server.
+
+    The proxy serves the bytes itself, including Range and conditional
+    requests, so Django only authorizes the download.
+    """
+    response = HttpResponse(content_type=content_type)
+    if settings.MODEL_DOWNLOAD_DELIVERY == 'x-accel-redirect':
+        relative = Path(path).resolve().relative_to(Path(settings.MODEL_STORAGE_ROOT).resolve())
+        response['X-Accel-Redirect'] = escape_uri_path(
+            settings.MODEL_ACCEL_REDIRECT_PREFIX.rstrip('/') + '/' + relative.as_posix()
+        )
+    else:
+        response['X-Sendfile'] = str(Path(path).resolve())
+    response['Content-Disposition'] = f'attachment; filename="{Path(path).name}"'
+    return response
+
+def ranged_file_response(request, path, etag=None, content_type='application/octet-stream'):
+    """
+    Serve a file from disk with support for Range, If-Range and ETag.
+
+    Depending on MODEL_DOWNLOAD_DELIVERY the file is streamed in chunks,
+    passed to the WSGI server's file wrapper (sendfile) or offloaded to the
+    proxy. Under ASGI the chunks come from an async iterator, so they are
+    not buffered in memory. Returns None if the file does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+    if settings.MODEL_DOWNLOAD_DELIVERY in ('x-accel-redirect', 'x-sendfile'):
+        return offload_response(path, content_type)
+
+    size = stat.st_size
+    etag = etag or file_etag(stat)
+    headers = {
+        'Accept-Ranges': 'bytes',
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+    }
+
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(',')]:
+        response = HttpResponse(status=304)
+        for header, value in headers.items():
+            response[header] = value
+        return response
+
+    byte_range = None
+    range_header = request.META.get('HTTP_RANGE')
+    if range_header and if_range_matches(request, etag, stat.st_mtime):
+        byte_range = parse_range_header(range_header, size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            response['Accept-Ranges'] = 'bytes'
+            return response
+
+    if byte_range:
+        start, end = byte_range
+        status_code = 206
+        headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+    else:
+        start, end = 0, size - 1
+        status_code = 200
+
+    length = end - start + 1
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        response = StreamingHttpResponse(
+            aiter_file(path, start, length),
+            status=status_code,
+            content_type=content_type
+        )
+    elif settings.MODEL_DOWNLOAD_DELIVERY == 'sendfile' and end == size - 1:
+        # wsgi.file_wrapper sends from the current offset to end of file,
+        # so only ranges that run to the end can use it
+        f = open(path, 'rb')
+        f.seek(start)
+        response = FileResponse(f, status=status_code, content_type=content_type)
+    else:
+        response = StreamingHttpResponse(
+            iter_file(path, start, length),
+            status=status_code,
+            content_type=content_type
+        )
+    response['Content-Length'] = str(length)
+    response['Content-Disposition'] = f'attachment; filename="{Path(path).name}"'
+    for header, value in headers.items():
+        response[header] = value
+    return response
@@ -0,0 +1,82 @@
+import time
+import uuid
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from accounts.models import User
+from accounts.serializers import UserProfileSerializer, user_profile_data
+from licenses.models import License
+from licenses.serializers import LicenseSerializer, license_data, license_row
+from models_api.models import ModelFile
+from models_api.serializers import MODEL_FILE_FIELDS, ModelFileSerializer, model_file_data
+from tiktrue_backend.renderers import FastJSONRenderer, orjson
+
+class Command(BaseCommand):
+    help = 'Measure serialization and JSON rendering cost per response of the hot read endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000, help='Responses timed per endpoint')
+        parser.add_argument('--models', type=int, default=10, help='Models in the available_models response')
+
+    def handle(self, *args, **options):
+        """Time ModelSerializer + JSONRenderer against values-row builders + FastJSONRenderer"""
+        now = timezone.now()
+        user = User(
+            id=uuid.uuid4(), email='benchmark@example.com', username='benchmark',
+            subscription_expires=now, created_at=now
+        )
+        license_obj = License(
+            id=uuid.uuid4(), user=user, license_key='X' * 39, expires_at=now,
+            last_validated=now, created_at=now
+        )
+        models = [
+            ModelFile(
+                id=uuid.uuid4(), name=f'model_{i}', display_name=f'Model {i}', version='1.0.0',
+                file_size=4 * 1024 ** 3, block_count=33, created_at=now, updated_at=now
+            )
+            for i in range(options['models'])
+        ]
+        # Rows as .values() returns them, so only serialization is timed
+        model_rows = [{field: getattr(model, field) for field in MODEL_FILE_FIELDS} for model in models]
+        license_values = license_row(license_obj)
+
+        before = JSONRenderer()
+        after = FastJSONRenderer()
+        cases = [
+            (
+                'available_models',
+                lambda: before.render({'models': ModelFileSerializer(models, many=True).data, 'total_models': len(models)}),
+                lambda: after.render({'models': [model_file_data(row) for row in model_rows], 'total_models': len(model_rows)}),
+            ),
+            (
+                'license_info',
+                lambda: before.render({'license': LicenseSerializer(license_obj).data}),
+                lambda: after.render({'license': license_data(license_values)}),
+            ),
+            (
+                'validate_license',
+                lambda: before.render({'valid': True, 'license': LicenseSerializer(license_obj).data}),
+                lambda: after.render({'valid': True, 'license': license_data(license_row(license_obj))}),
+            ),
+            (
+                'profile',
+                lambda: before.render(UserProfileSerializer(user).data),
+                lambda: after.render(user_profile_data(user)),
+            ),
+        ]
+
+        self.stdout.write(f'JSON encoder: {"orjson" if orjson else "stdlib json"}\n')
+        self.stdout.write(f'{"endpoint":<18} {"before":>10} {"after":>10} {"speedup":>8}')
+        for name, old, new in cases:
+            if old() != new():
+                self.stdout.write(self.style.WARNING(f'{name}: rendered output differs'))
+            old_us = self.time(old, options['iterations'])
+            new_us = self.time(new, options['iterations'])
+            self.stdout.write(f'{name:<18} {old_us:>8.1f}us {new_us:>8.1f}us {old_us / new_us:>7.1f}x')
+
+    def time(self, render, iterations):
+        """Microseconds per call of render"""
+        start = time.perf_counter()
+        for _ in range(iterations):
+            render()
+        return (time.perf_counter() - start) / iterations * 1e6
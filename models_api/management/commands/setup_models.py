@@ -1,9 +1,26 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
 from django.core.management.base import BaseCommand
-from models_api.models import ModelFile
+from models_api.files import find_block_files, hash_file, store_object
+from models_api.models import ModelFile, ModelBlock
 
 class Command(BaseCommand):
     help = 'Setup initial model records in database'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hash-blocks',
+            action='store_true',
+            help='Hash block files, add them to the content-addressed store and build the manifest'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count(),
+            help='Number of processes used to hash block files'
+        )
+
     def handle(self, *args, **options):
         """Create model records without actual files"""
         
@@ -41,10 +58,64 @@ class Command(BaseCommand):
                     self.style.WARNING(f'Model already exists: {model.display_name}')
                 )
         
+        if options['hash_blocks']:
+            self.build_manifests(options['workers'])
+        
         self.stdout.write(
             self.style.SUCCESS('Model setup completed!')
         )
         
         self.stdout.write(
             self.style.WARNING('Note: Actual model files need to be uploaded separately to cloud storage')
-        )
\ No newline at end of file
+        )
+    
+    def build_manifests(self, workers):
+        """Hash block files in parallel and store the per-block manifest"""
+        chunk_size = settings.MODEL_DOWNLOAD_CHUNK_SIZE
+        segment_size = settings.MODEL_TRANSFER_SEGMENT_SIZE
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for model in ModelFile.objects.all():
+                block_files = find_block_files(model)
+                if not block_files:
+                    self.stdout.write(
+                        self.style.WARNING(f'No block files found for: {model.display_name}')
+                    )
+                    continue
+                
+                paths = [path for _, path in block_files]
+                results = executor.map(
+                    hash_file, paths, [chunk_size] * len(paths), [segment_size] * len(paths)
+                )
+                
+                total_size = 0
+                for (block_index, path), (sha256, size, segment_hashes) in zip(block_files, results):
+                    ModelBlock.objects.update_or_create(
+                        model=model,
+                        version=model.version,
+                        block_index=block_index,
+                        defaults={
+                            'filename': path.name,
+                            'size': size,
+                            'sha256': sha256,
+                            'segment_size': segment_size,
+                            'segment_hashes': segment_hashes,
+                            'storage_path': store_object(path, sha256),
+                        }
+                    )
+                    total_size += size
+                
+                # Drop manifest entries for blocks not in this upload
+                ModelBlock.objects.filter(model=model, version=model.version).exclude(
+                    block_index__in=[block_index for block_index, _ in block_files]
+                ).delete()
+                
+                model.block_count = len(block_files)
+                model.file_size = total_size
+                model.save()
+                
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'Hashed {len(block_files)} blocks for: {model.display_name} {model.version}'
+                    )
+                )
\ No newline at end of file
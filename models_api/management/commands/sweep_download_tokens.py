@@ -0,0 +1,39 @@
+import time
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from models_api.models import ModelDownload
+
+class Command(BaseCommand):
+    help = 'Close or delete expired download tokens in small batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--delete',
+            action='store_true',
+            help='Delete expired tokens instead of closing them'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Tokens handled per statement')
+        parser.add_argument('--sleep', type=float, default=0, help='Seconds to pause between batches')
+
+    def handle(self, *args, **options):
+        """Sweep tokens that expired without being completed"""
+        now = timezone.now()
+        expired = ModelDownload.objects.filter(is_completed=False, expires_at__lte=now)
+        total = 0
+        
+        while True:
+            ids = list(expired.order_by('expires_at').values_list('pk', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            batch = ModelDownload.objects.filter(pk__in=ids)
+            if options['delete']:
+                batch.delete()
+            else:
+                # Closed tokens leave the partial expiry index; completed_at stays empty
+                batch.update(is_completed=True)
+            total += len(ids)
+            if options['sleep']:
+                time.sleep(options['sleep'])
+        
+        action = 'Deleted' if options['delete'] else 'Closed'
+        self.stdout.write(self.style.SUCCESS(f'{action} {total} expired download tokens'))
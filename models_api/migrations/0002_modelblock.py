@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-16 19:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models_api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModelBlock',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('block_index', models.IntegerField(help_text='1-based block number')),
+                ('filename', models.CharField(max_length=255)),
+                ('size', models.BigIntegerField(help_text='Size in bytes')),
+                ('sha256', models.CharField(max_length=64)),
+                ('storage_path', models.CharField(help_text='Path relative to MODEL_STORAGE_ROOT', max_length=500)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blocks', to='models_api.modelfile')),
+            ],
+            options={
+                'ordering': ['block_index'],
+                'unique_together': {('model', 'block_index')},
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-16 19:03
+
+from django.db import migrations, models
+
+
+def copy_model_version(apps, schema_editor):
+    ModelFile = apps.get_model('models_api', 'ModelFile')
+    ModelBlock = apps.get_model('models_api', 'ModelBlock')
+    for model in ModelFile.objects.all():
+        ModelBlock.objects.filter(model=model).update(version=model.version)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models_api', '0002_modelblock'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='modelblock',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='modelblock',
+            name='version',
+            field=models.CharField(default='1.0.0', max_length=50),
+        ),
+        migrations.RunPython(copy_model_version, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='modelblock',
+            name='storage_path',
+            field=models.CharField(help_text='Content-addressed path relative to MODEL_STORAGE_ROOT', max_length=500),
+        ),
+        migrations.AlterUniqueTogether(
+            name='modelblock',
+            unique_together={('model', 'version', 'block_index')},
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-16 19:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+import tiktrue_backend.migration_operations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('models_api', '0003_modelblock_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModelDownloadDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('total_count', models.IntegerField(default=0)),
+                ('completed_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-date'],
+            },
+        ),
+        tiktrue_backend.migration_operations.AddIndexConcurrently(
+            model_name='modeldownload',
+            index=models.Index(fields=['started_at'], name='modeldownload_started_idx'),
+        ),
+        migrations.AddField(
+            model_name='modeldownloaddaily',
+            name='model',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_downloads', to='models_api.modelfile'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='modeldownloaddaily',
+            unique_together={('model', 'date')},
+        ),
+    ]
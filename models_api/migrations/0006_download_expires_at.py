@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-16 19:11
+
+from datetime import timedelta
+from django.db import migrations, models
+import models_api.models
+import tiktrue_backend.migration_operations
+
+BATCH_SIZE = 5000
+
+
+def expire_existing_tokens(apps, schema_editor):
+    # Existing tokens were valid for one hour after they were issued. Update
+    # in primary key ranges so each statement locks few rows.
+    ModelDownload = apps.get_model('models_api', 'ModelDownload')
+    ids = ModelDownload.objects.order_by('pk').values_list('pk', flat=True)
+    last = None
+    while True:
+        batch = ids.filter(pk__gt=last) if last is not None else ids
+        upper = list(batch[BATCH_SIZE - 1:BATCH_SIZE])
+        rows = batch.filter(pk__lte=upper[0]) if upper else batch
+        rows.update(expires_at=models.F('started_at') + timedelta(hours=1))
+        if not upper:
+            break
+        last = upper[0]
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('models_api', '0005_download_daily_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='modeldownload',
+            name='expires_at',
+            field=models.DateTimeField(default=models_api.models.default_download_expiry),
+        ),
+        migrations.RunPython(expire_existing_tokens, migrations.RunPython.noop),
+        tiktrue_backend.migration_operations.AddIndexConcurrently(
+            model_name='modeldownload',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['expires_at'], name='modeldownload_expiry_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-16 19:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('models_api', '0006_download_expires_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='modelblock',
+            name='segment_hashes',
+            field=models.JSONField(blank=True, default=list, help_text='SHA-256 of each segment, in order'),
+        ),
+        migrations.AddField(
+            model_name='modelblock',
+            name='segment_size',
+            field=models.BigIntegerField(blank=True, help_text='Bytes covered by each segment hash', null=True),
+        ),
+    ]
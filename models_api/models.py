@@ -1,7 +1,13 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+from datetime import timedelta
 import uuid
 
+def default_download_expiry():
+    """Expiry time for a newly issued download token"""
+    return timezone.now() + timedelta(seconds=settings.MODEL_DOWNLOAD_TOKEN_TTL)
+
 class ModelFile(models.Model):
     """Model file information and metadata"""
     
@@ -52,7 +58,56 @@ class ModelDownload(models.Model):
     user_agent = models.TextField(blank=True)
     is_completed = models.BooleanField(default=False)
     started_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(default=default_download_expiry)
     completed_at = models.DateTimeField(null=True, blank=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['started_at'], name='modeldownload_started_idx'),
+            models.Index(
+                fields=['expires_at'],
+                condition=models.Q(is_completed=False),
+                name='modeldownload_expiry_idx'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.email} - {self.model.name} - {self.started_at}"
+
+class ModelDownloadDaily(models.Model):
+    """Daily rollup of model downloads past the retention window"""
+    
+    model = models.ForeignKey(ModelFile, on_delete=models.CASCADE, related_name='daily_downloads')
+    date = models.DateField()
+    total_count = models.IntegerField(default=0)
+    completed_count = models.IntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['model', 'date']
+        ordering = ['-date']
+    
+    def __str__(self):
+        return f"{self.model.name} - {self.date}"
+
+class ModelBlock(models.Model):
+    """Per-block content manifest of a model"""
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    model = models.ForeignKey(ModelFile, on_delete=models.CASCADE, related_name='blocks')
+    version = models.CharField(max_length=50, default='1.0.0')
+    block_index = models.IntegerField(help_text='1-based block number')
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField(help_text='Size in bytes')
+    sha256 = models.CharField(max_length=64)
+    storage_path = models.CharField(max_length=500, help_text='Content-addressed path relative to MODEL_STORAGE_ROOT')
+    segment_size = models.BigIntegerField(null=True, blank=True, help_text='Bytes covered by each segment hash')
+    segment_hashes = models.JSONField(default=list, blank=True, help_text='SHA-256 of each segment, in order')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['model', 'version', 'block_index']
+        ordering = ['block_index']
+    
     def __str__(self):
-        return f"{self.user.email} - {self.model.name} - {self.started_at}"
\ No newline at end of file
+        return f"{self.model.name} {self.version} - {self.filename}"
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from tiktrue_backend.serializers import datetime_field
 from .models import ModelFile, ModelAccess, ModelDownload
 
 class ModelFileSerializer(serializers.ModelSerializer):
@@ -30,4 +31,41 @@ class ModelDownloadSerializer(serializers.ModelSerializer):
             'id', 'model', 'download_token', 'is_completed',
             'started_at', 'completed_at'
         ]
-        read_only_fields = ['id', 'download_token', 'started_at', 'completed_at']
\ No newline at end of file
+        read_only_fields = ['id', 'download_token', 'started_at', 'completed_at']
+
+class BatchDownloadItemSerializer(serializers.Serializer):
+    model_id = serializers.UUIDField()
+    blocks = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, required=False
+    )
+
+class BatchDownloadSerializer(serializers.Serializer):
+    models = BatchDownloadItemSerializer(many=True, allow_empty=False, max_length=len(ModelFile.MODEL_TYPES))
+    signed_urls = serializers.BooleanField(default=False)
+    
+    def validate_models(self, value):
+        model_ids = [item['model_id'] for item in value]
+        if len(set(model_ids)) != len(model_ids):
+            raise serializers.ValidationError('Each model can only be requested once')
+        return value
+
+MODEL_FILE_FIELDS = ModelFileSerializer.Meta.fields
+
+def model_file_row(model):
+    """Values row of a ModelFile instance"""
+    return {field: getattr(model, field) for field in MODEL_FILE_FIELDS}
+
+def model_file_data(row):
+    """Serialize a ModelFile values row exactly like ModelFileSerializer"""
+    return {
+        'id': str(row['id']),
+        'name': row['name'],
+        'display_name': row['display_name'],
+        'description': row['description'],
+        'version': row['version'],
+        'file_size': row['file_size'],
+        'block_count': row['block_count'],
+        'is_active': row['is_active'],
+        'created_at': datetime_field.to_representation(row['created_at']),
+        'updated_at': datetime_field.to_representation(row['updated_at'])
+    }
\ No newline at end of file
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .catalog import bump_catalog_version
+from .models import ModelFile
+
+@receiver(post_save, sender=ModelFile)
+@receiver(post_delete, sender=ModelFile)
+def invalidate_catalog(sender, **kwargs):
+    """Bump catalog version whenever a model file changes"""
+    bump_catalog_version()
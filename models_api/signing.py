@@ -0,0 +1,64 @@
+import base64
+import hashlib
+import hmac
+import re
+import time
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+
+def signing_enabled():
+    """Whether a dedicated MODEL_URL_SIGNING_KEY is configured"""
+    key = settings.MODEL_URL_SIGNING_KEY
+    return bool(key) and key != settings.SECRET_KEY
+
+def block_signature(model_name, block_id, sha256, user_id, expires):
+    """
+    HMAC-SHA256 over the canonical string of a signed block URL.
+
+    The canonical string is "model:block:sha256:user:expires", so a proxy
+    holding MODEL_URL_SIGNING_KEY can validate URLs the same way.
+    """
+    if not signing_enabled():
+        raise ImproperlyConfigured('A dedicated MODEL_URL_SIGNING_KEY is required for signed block URLs')
+    message = f'{model_name}:{block_id}:{sha256}:{user_id}:{expires}'.encode()
+    digest = hmac.new(settings.MODEL_URL_SIGNING_KEY.encode(), message, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b'=').decode()
+
+def signed_block_url(model_name, block_id, sha256, user_id, expires):
+    """Build a time-limited block URL that is authorized without a database query"""
+    expires = int(expires)
+    query = urlencode({
+        'user': user_id,
+        'sha256': sha256,
+        'expires': expires,
+        'signature': block_signature(model_name, block_id, sha256, user_id, expires),
+    })
+    return f'/api/v1/models/signed/{model_name}/block/{block_id}/?{query}'
+
+def verify_block_signature(model_name, block_id, params):
+    """
+    Check a signed block URL.
+
+    Returns (sha256, None) when valid, otherwise (None, reason) where
+    reason is 'invalid' or 'expired'.
+    """
+    if not signing_enabled():
+        return None, 'invalid'
+    sha256 = params.get('sha256', '')
+    try:
+        expires = int(params.get('expires', ''))
+    except ValueError:
+        return None, 'invalid'
+    if sha256 and not SHA256_RE.match(sha256):
+        return None, 'invalid'
+    
+    expected = block_signature(model_name, block_id, sha256, params.get('user', ''), expires)
+    # Compare bytes; compare_digest rejects non-ASCII str
+    if not hmac.compare_digest(expected.encode(), params.get('signature', '').encode()):
+        return None, 'invalid'
+    if expires < time.time():
+        return None, 'expired'
+    return sha256, None
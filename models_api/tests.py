@@ -0,0 +1,242 @@
+import os
+import shutil
+import tempfile
+import time
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework.test import APITestCase
+from accounts.models import User
+from .files import block_path, parse_range_header, ranged_file_response
+from .models import ModelAccess, ModelDownload, ModelFile
+from .signing import signed_block_url, verify_block_signature
+
+class AvailableModelsQueryTests(APITestCase):
+    """available_models runs a constant number of queries however many models exist"""
+    
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='user@example.com', username='user', password='password123')
+        self.models = [
+            ModelFile.objects.create(name=name, display_name=display_name, file_size=1000, block_count=3)
+            for name, display_name in ModelFile.MODEL_TYPES
+        ]
+        self.client.force_authenticate(self.user)
+        self.url = reverse('available_models')
+    
+    def test_first_call_creates_missing_access_rows(self):
+        # Models, existing access rows, one bulk insert of the missing ones
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total_models'], len(self.models))
+        self.assertEqual(ModelAccess.objects.filter(user=self.user).count(), len(self.models))
+    
+    def test_call_with_existing_access_rows(self):
+        for model in self.models:
+            ModelAccess.objects.create(user=self.user, model=model)
+        
+        # Models and existing access rows, nothing to insert
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, secure=True)
+        self.assertEqual(response.status_code, 200)
+        
+        # The catalog is cached now, leaving only the access check
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ModelAccess.objects.filter(user=self.user).count(), len(self.models))
+
+class ParseRangeHeaderTests(SimpleTestCase):
+    """Single byte ranges are parsed, unsatisfiable ones rejected and others ignored"""
+    
+    def test_bounded_and_open_ranges(self):
+        self.assertEqual(parse_range_header('bytes=0-9', 100), (0, 9))
+        self.assertEqual(parse_range_header('bytes=90-', 100), (90, 99))
+        self.assertEqual(parse_range_header('bytes=90-500', 100), (90, 99))
+    
+    def test_suffix_ranges(self):
+        self.assertEqual(parse_range_header('bytes=-10', 100), (90, 99))
+        self.assertEqual(parse_range_header('bytes=-500', 100), (0, 99))
+        self.assertIs(parse_range_header('bytes=-0', 100), False)
+    
+    def test_unsatisfiable_ranges(self):
+        self.assertIs(parse_range_header('bytes=100-', 100), False)
+        self.assertIs(parse_range_header('bytes=-10', 0), False)
+    
+    def test_ignored_ranges(self):
+        for header in ('bytes=0-1,5-6', 'items=0-9', 'bytes=9-2', 'bytes=-'):
+            self.assertIsNone(parse_range_header(header, 100), header)
+
+@override_settings(MODEL_DOWNLOAD_DELIVERY='stream')
+class RangedFileResponseTests(SimpleTestCase):
+    """Files are served whole or in part depending on Range and If-Range"""
+    
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        with os.fdopen(fd, 'wb') as f:
+            f.write(bytes(range(100)))
+        self.mtime = os.stat(self.path).st_mtime
+        self.factory = RequestFactory()
+    
+    def tearDown(self):
+        os.remove(self.path)
+    
+    def get(self, **headers):
+        response = ranged_file_response(self.factory.get('/', **headers), self.path, etag='"v1"')
+        self.addCleanup(response.close)
+        return response
+    
+    def test_full_file(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(b''.join(response.streaming_content), bytes(range(100)))
+    
+    def test_suffix_range(self):
+        response = self.get(HTTP_RANGE='bytes=-10')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 90-99/100')
+        self.assertEqual(b''.join(response.streaming_content), bytes(range(90, 100)))
+    
+    def test_unsatisfiable_range(self):
+        response = self.get(HTTP_RANGE='bytes=100-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */100')
+    
+    def test_if_range(self):
+        self.assertEqual(self.get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"v1"').status_code, 206)
+        self.assertEqual(self.get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=http_date(self.mtime)).status_code, 206)
+        # A changed file is sent whole instead of the stale range
+        self.assertEqual(self.get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"v0"').status_code, 200)
+        self.assertEqual(self.get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='W/"v1"').status_code, 200)
+        self.assertEqual(self.get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=http_date(self.mtime - 60)).status_code, 200)
+    
+    def test_not_modified(self):
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH='"v1"').status_code, 304)
+    
+    def test_missing_file(self):
+        request = self.factory.get('/')
+        self.assertIsNone(ranged_file_response(request, self.path + '.missing'))
+
+@override_settings(MODEL_URL_SIGNING_KEY='test-url-signing-key')
+class BlockSignatureTests(SimpleTestCase):
+    """Signed block URLs verify only unchanged and unexpired"""
+    
+    def params(self, **changes):
+        url = signed_block_url('mistral_7b_int4', 2, 'a' * 64, 7, time.time() + 60)
+        params = dict(pair.split('=', 1) for pair in url.split('?', 1)[1].split('&'))
+        params.update(changes)
+        return params
+    
+    def test_valid(self):
+        self.assertEqual(verify_block_signature('mistral_7b_int4', 2, self.params()), ('a' * 64, None))
+    
+    def test_tampered(self):
+        self.assertEqual(verify_block_signature('mistral_7b_int4', 3, self.params()), (None, 'invalid'))
+        self.assertEqual(verify_block_signature('mistral_7b_int4', 2, self.params(user='8')), (None, 'invalid'))
+        self.assertEqual(verify_block_signature('mistral_7b_int4', 2, self.params(sha256='b' * 64)), (None, 'invalid'))
+        self.assertEqual(verify_block_signature('mistral_7b_int4', 2, self.params(expires='x')), (None, 'invalid'))
+    
+    def test_non_ascii_signature(self):
+        self.assertEqual(verify_block_signature('mistral_7b_int4', 2, self.params(signature='\xe9')), (None, 'invalid'))
+    
+    def test_expired(self):
+        url = signed_block_url('mistral_7b_int4', 2, '', 7, time.time() - 1)
+        params = dict(pair.split('=', 1) for pair in url.split('?', 1)[1].split('&'))
+        self.assertEqual(verify_block_signature('mistral_7b_int4', 2, params), (None, 'expired'))
+    
+    @override_settings(MODEL_URL_SIGNING_KEY='')
+    def test_without_key(self):
+        self.assertEqual(verify_block_signature('mistral_7b_int4', 2, {}), (None, 'invalid'))
+
+class DownloadTestCase(APITestCase):
+    """Authenticated user with a model whose block files are on disk"""
+    
+    def setUp(self):
+        cache.clear()
+        storage = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, storage)
+        storage_settings = override_settings(MODEL_STORAGE_ROOT=storage, MODEL_DOWNLOAD_DELIVERY='stream')
+        storage_settings.enable()
+        self.addCleanup(storage_settings.disable)
+        
+        self.user = User.objects.create_user(email='user@example.com', username='user', password='password123')
+        self.models = [
+            ModelFile.objects.create(name=name, display_name=display_name, file_size=1000, block_count=3)
+            for name, display_name in ModelFile.MODEL_TYPES
+        ]
+        self.model = self.models[0]
+        for block_id in range(1, 4):
+            path = block_path(self.model, block_id)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b'x' * 100)
+        self.client.force_authenticate(self.user)
+
+@override_settings(MODEL_TRANSFER_MAX_CONNECTIONS=2)
+class ConnectionLimitTests(DownloadTestCase):
+    """Block downloads of one token are capped at MODEL_TRANSFER_MAX_CONNECTIONS open responses"""
+    
+    def test_limit_and_release(self):
+        token = self.client.post(
+            reverse('create_download_token', args=[self.model.id]), secure=True
+        ).json()['download_token']
+        url = reverse('download_block', args=[token, 1])
+        
+        open_responses = [self.client.get(url, secure=True) for _ in range(2)]
+        self.assertEqual([response.status_code for response in open_responses], [200, 200])
+        response = self.client.get(url, secure=True)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '1')
+        
+        # Closing a response frees its slot
+        open_responses[0].close()
+        response = self.client.get(url, secure=True)
+        self.assertEqual(response.status_code, 200)
+        response.close()
+        open_responses[1].close()
+    
+    def test_missing_block_releases_slot(self):
+        token = self.client.post(
+            reverse('create_download_token', args=[self.model.id]), secure=True
+        ).json()['download_token']
+        os.remove(block_path(self.model, 3))
+        for _ in range(3):
+            response = self.client.get(reverse('download_block', args=[token, 3]), secure=True)
+            self.assertEqual(response.status_code, 404)
+
+class BatchDownloadTests(DownloadTestCase):
+    """The batch endpoint issues tokens for several models in a constant number of queries"""
+    
+    def post(self, data):
+        return self.client.post(reverse('create_download_tokens'), data, format='json', secure=True)
+    
+    def test_constant_queries(self):
+        for model in self.models:
+            ModelAccess.objects.create(user=self.user, model=model)
+        
+        # Models, download insert, existing access rows and download count
+        # update, however many models are requested
+        for models in (self.models[:1], self.models):
+            with self.assertNumQueries(4):
+                response = self.post({'models': [{'model_id': str(model.id)} for model in models]})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json()['downloads']), len(models))
+        self.assertEqual(ModelDownload.objects.filter(user=self.user).count(), 1 + len(self.models))
+    
+    def test_block_subsets(self):
+        response = self.post({'models': [{'model_id': str(self.model.id), 'blocks': [3, 1, 3]}]})
+        self.assertEqual(response.status_code, 200)
+        download = response.json()['downloads'][0]
+        self.assertEqual([block['block_id'] for block in download['blocks']], [1, 3])
+        
+        response = self.post({'models': [{'model_id': str(self.model.id), 'blocks': [4]}]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['blocks'], [4])
+    
+    @override_settings(MODEL_URL_SIGNING_KEY='')
+    def test_signed_urls_without_key(self):
+        response = self.post({'models': [{'model_id': str(self.model.id)}], 'signed_urls': True})
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(ModelDownload.objects.exists())
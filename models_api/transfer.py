@@ -0,0 +1,103 @@
+import time
+from django.conf import settings
+from django.core.cache import cache
+
+CONNECTIONS_KEY = 'models_api:connections:{}:{}'
+
+def block_segments(block):
+    """
+    Split a manifest block into byte-range segments, with hashes when recorded.
+
+    Blocks with recorded hashes keep the segment size they were hashed with,
+    which may differ from the current MODEL_TRANSFER_SEGMENT_SIZE.
+    """
+    segment_size = block.segment_size if block.segment_hashes else settings.MODEL_TRANSFER_SEGMENT_SIZE
+    segments = []
+    for i, start in enumerate(range(0, block.size, segment_size)):
+        end = min(start + segment_size, block.size) - 1
+        segments.append({
+            'block_id': block.block_index,
+            'start': start,
+            'end': end,
+            'size': end - start + 1,
+            'segment_size': segment_size,
+            'sha256': block.segment_hashes[i] if block.segment_hashes else None
+        })
+    return segments
+
+def transfer_plan(manifest):
+    """
+    Plan a parallel download of a model from its block manifest.
+
+    Segments are byte ranges of blocks (end inclusive, as in a Range
+    header), so a client can fetch them over several connections and verify
+    each one. Concurrency is capped by MODEL_TRANSFER_MAX_CONNECTIONS, which
+    block serving enforces per token. Returns None without a manifest, as
+    block sizes are unknown.
+    """
+    if not manifest:
+        return None
+    segments = [segment for block in manifest for segment in block_segments(block)]
+    max_connections = settings.MODEL_TRANSFER_MAX_CONNECTIONS or len(segments)
+    return {
+        'total_size': sum(block.size for block in manifest),
+        'recommended_concurrency': max(1, min(max_connections, len(segments))),
+        'max_connections': settings.MODEL_TRANSFER_MAX_CONNECTIONS or None,
+        'segments': segments
+    }
+
+def acquire_connection(key):
+    """
+    Take one of the concurrent connection slots of a download.
+
+    Returns the slot to pass to release_connection, or None when all slots
+    are in use. Counters are created once per MODEL_TRANSFER_CONNECTION_TIMEOUT
+    window with cache.add and only changed with incr/decr. The window is part
+    of the key, so slots leaked by killed workers are dropped when it ends,
+    however the cache backend treats timeouts on incr. Connections still open
+    from the previous window are not counted in the new one, so up to twice
+    the cap can be open right after a window boundary.
+    """
+    timeout = settings.MODEL_TRANSFER_CONNECTION_TIMEOUT
+    slot = CONNECTIONS_KEY.format(key, int(time.time() // timeout))
+    if not settings.MODEL_TRANSFER_MAX_CONNECTIONS:
+        return slot
+    cache.add(slot, 0, timeout)
+    try:
+        count = cache.incr(slot)
+    except ValueError:
+        # Counter evicted between add and incr; let this connection through
+        return slot
+    if count > settings.MODEL_TRANSFER_MAX_CONNECTIONS:
+        release_connection(slot)
+        return None
+    return slot
+
+def release_connection(slot):
+    """Give back a connection slot taken by acquire_connection"""
+    if not settings.MODEL_TRANSFER_MAX_CONNECTIONS:
+        return
+    try:
+        cache.decr(slot)
+    except ValueError:
+        # Counter already expired
+        pass
+
+def release_on_close(response, slot):
+    """Release the connection slot once the server has finished sending response"""
+    close = response.close
+    released = False
+    
+    # WSGI and ASGI servers call close() after the last byte of a streamed
+    # file has been sent, or when the client goes away
+    def close_and_release():
+        nonlocal released
+        try:
+            close()
+        finally:
+            if not released:
+                released = True
+                release_connection(slot)
+    
+    response.close = close_and_release
+    return response
@@ -1,9 +1,19 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
+
+# Under ASGI the download views run as coroutines
+download_views = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
     path('available/', views.available_models, name='available_models'),
     path('<uuid:model_id>/metadata/', views.model_metadata, name='model_metadata'),
     path('<uuid:model_id>/download/', views.create_download_token, name='create_download_token'),
-    path('download/<str:download_token>/', views.download_model, name='download_model'),
+    path('<uuid:model_id>/delta/', views.model_delta, name='model_delta'),
+    path('download/batch/', views.create_download_tokens, name='create_download_tokens'),
+    path('download/<str:download_token>/', download_views.download_model, name='download_model'),
+    path('download/<str:download_token>/block/<int:block_id>/', download_views.download_block, name='download_block'),
+    path('download/<str:download_token>/tokenizer/', views.download_tokenizer, name='download_tokenizer'),
+    path('download/<str:download_token>/metadata/', views.download_metadata, name='download_metadata'),
+    path('signed/<str:model_name>/block/<int:block_id>/', views.download_signed_block, name='download_signed_block'),
 ]
\ No newline at end of file
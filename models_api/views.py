@@ -1,14 +1,27 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from django.db.models import F, Q
 from django.utils import timezone
+from django.utils.http import quote_etag
 from django.http import HttpResponse, Http404
 from django.conf import settings
 import os
 import secrets
-from .models import ModelFile, ModelAccess, ModelDownload
-from .serializers import ModelFileSerializer
+from .models import ModelFile, ModelAccess, ModelDownload, ModelBlock
+from .serializers import (
+    MODEL_FILE_FIELDS, BatchDownloadSerializer, ModelFileSerializer, model_file_data, model_file_row
+)
+from .catalog import (
+    catalog_etag, catalog_key, catalog_response, get_catalog_entry, get_catalog_version, not_modified
+)
+from .files import (
+    block_path, object_storage_path, storage_file, tokenizer_path, metadata_path,
+    ranged_file_response
+)
+from .signing import signed_block_url, signing_enabled, verify_block_signature
+from .transfer import acquire_connection, release_connection, release_on_close, transfer_plan
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -17,26 +30,41 @@ def available_models(request):
     user = request.user
     allowed_models = user.get_allowed_models()
     
-    # Get active models that user has access to
-    models = ModelFile.objects.filter(
-        name__in=allowed_models,
-        is_active=True
-    )
+    version = get_catalog_version()
+    key = catalog_key('available', user.subscription_plan, allowed_models)
+    etag = catalog_etag(version, key)
+    if not_modified(request, etag):
+        return catalog_response(b'', etag, status=status.HTTP_304_NOT_MODIFIED)
     
-    # Create or update model access records
-    for model in models:
-        ModelAccess.objects.get_or_create(
-            user=user,
-            model=model,
-            defaults={'access_granted': True}
-        )
+    def build():
+        # Get active models that user has access to
+        models = list(ModelFile.objects.filter(
+            name__in=allowed_models,
+            is_active=True
+        ).values(*MODEL_FILE_FIELDS))
+        data = {
+            'models': [model_file_data(model) for model in models],
+            'user_plan': user.subscription_plan,
+            'total_models': len(models)
+        }
+        return data, {'model_ids': [model['id'] for model in models]}
     
-    serializer = ModelFileSerializer(models, many=True)
-    return Response({
-        'models': serializer.data,
-        'user_plan': user.subscription_plan,
-        'total_models': models.count()
-    })
+    entry = get_catalog_entry(version, key, build)
+    ensure_model_access(user, entry['model_ids'])
+    return catalog_response(entry['body'], etag)
+
+def ensure_model_access(user, model_ids):
+    """Create missing model access records in a constant number of queries"""
+    existing = set(
+        ModelAccess.objects.filter(user=user, model_id__in=model_ids).values_list('model_id', flat=True)
+    )
+    missing = [
+        ModelAccess(user=user, model_id=model_id, access_granted=True)
+        for model_id in model_ids
+        if model_id not in existing
+    ]
+    if missing:
+        ModelAccess.objects.bulk_create(missing, ignore_conflicts=True)
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -54,6 +82,14 @@ def create_download_token(request, model_id):
     if model.name not in allowed_models:
         return Response({'error': 'Access denied to this model'}, status=status.HTTP_403_FORBIDDEN)
     
+    # Signed block URLs are authorized without any database query
+    signed = request.data.get('signed_urls') if isinstance(request.data, dict) else None
+    if signed is None:
+        signed = request.GET.get('signed', '')
+    signed = str(signed).lower() in ('1', 'true')
+    if signed and not signing_enabled():
+        return signed_urls_unavailable()
+    
     # Generate download token
     download_token = secrets.token_urlsafe(32)
     
@@ -67,64 +103,310 @@ def create_download_token(request, model_id):
     )
     
     # Update model access
-    model_access, created = ModelAccess.objects.get_or_create(
-        user=user,
-        model=model,
-        defaults={'access_granted': True}
+    ensure_model_access(user, [model.id])
+    ModelAccess.objects.filter(user=user, model=model).update(
+        download_count=F('download_count') + 1,
+        last_download=timezone.now()
     )
-    model_access.download_count += 1
-    model_access.last_download = timezone.now()
-    model_access.save()
     
-    return Response({
+    data = {
         'download_token': download_token,
         'model_info': ModelFileSerializer(model).data,
-        'expires_in': 3600,  # 1 hour
+        'expires_in': settings.MODEL_DOWNLOAD_TOKEN_TTL,
         'download_url': f'/api/v1/models/download/{download_token}/'
-    })
+    }
+    
+    if signed:
+        data['signed_blocks'] = signed_blocks(model, user, download_record.expires_at)
+    
+    return Response(data)
 
-@api_view(['GET'])
+def signed_urls_unavailable():
+    """503 for signed URL requests when no dedicated signing key is configured"""
+    return Response(
+        {'error': 'Signed block URLs are not configured'}, status=status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
+def signed_blocks(model, user, expires_at, manifest=None, block_ids=None):
+    """Build signed, time-limited URLs for the blocks of a model, all of them by default"""
+    expires = expires_at.timestamp()
+    if manifest is None:
+        manifest = list(model.blocks.filter(version=model.version))
+    if manifest:
+        blocks = [(block.block_index, block.sha256) for block in manifest]
+    else:
+        blocks = [(i + 1, '') for i in range(model.block_count)]
+    if block_ids:
+        blocks = [(block_id, sha256) for block_id, sha256 in blocks if block_id in block_ids]
+    return [
+        {
+            'block_id': block_id,
+            'download_url': signed_block_url(model.name, block_id, sha256, user.id, expires)
+        }
+        for block_id, sha256 in blocks
+    ]
+
+@api_view(['POST'])
 @permission_classes([IsAuthenticated])
-def download_model(request, download_token):
-    """Download model using secure token"""
+def create_download_tokens(request):
+    """Create download tokens for several models, optionally for block subsets, in one call"""
+    user = request.user
+    serializer = BatchDownloadSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    if serializer.validated_data['signed_urls'] and not signing_enabled():
+        return signed_urls_unavailable()
+    
+    items = serializer.validated_data['models']
+    model_ids = [item['model_id'] for item in items]
+    models = {
+        model.id: model
+        for model in ModelFile.objects.filter(id__in=model_ids, is_active=True)
+    }
+    missing = [str(model_id) for model_id in model_ids if model_id not in models]
+    if missing:
+        return Response({'error': 'Model not found', 'model_ids': missing}, status=status.HTTP_404_NOT_FOUND)
+    
+    # Check access to every model against one allowed models lookup
+    allowed_models = user.get_allowed_models()
+    denied = [str(model_id) for model_id in model_ids if models[model_id].name not in allowed_models]
+    if denied:
+        return Response(
+            {'error': 'Access denied to this model', 'model_ids': denied}, status=status.HTTP_403_FORBIDDEN
+        )
+    
+    for item in items:
+        block_count = models[item['model_id']].block_count
+        invalid = sorted(block_id for block_id in item.get('blocks', []) if block_id > block_count)
+        if invalid:
+            return Response(
+                {'error': 'Block not found', 'model_id': str(item['model_id']), 'blocks': invalid},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    
+    # Create all download records in a single insert
+    ip_address = get_client_ip(request)
+    user_agent = request.META.get('HTTP_USER_AGENT', '')
+    downloads = [
+        ModelDownload(
+            user=user,
+            model=models[model_id],
+            download_token=secrets.token_urlsafe(32),
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+        for model_id in model_ids
+    ]
+    ModelDownload.objects.bulk_create(downloads)
+    
+    # Update model access
+    ensure_model_access(user, model_ids)
+    ModelAccess.objects.filter(user=user, model_id__in=model_ids).update(
+        download_count=F('download_count') + 1,
+        last_download=timezone.now()
+    )
+    
+    manifests = {}
+    if serializer.validated_data['signed_urls']:
+        # Current manifests of all models in one query
+        versions = Q()
+        for model in models.values():
+            versions |= Q(model=model, version=model.version)
+        for block in ModelBlock.objects.filter(versions):
+            manifests.setdefault(block.model_id, []).append(block)
+    
+    results = []
+    for item, download_record in zip(items, downloads):
+        model = download_record.model
+        token = download_record.download_token
+        block_ids = sorted(set(item.get('blocks', [])))
+        data = {
+            'model_id': str(model.id),
+            'download_token': token,
+            'model_info': model_file_data(model_file_row(model)),
+            'expires_in': settings.MODEL_DOWNLOAD_TOKEN_TTL,
+            'download_url': f'/api/v1/models/download/{token}/'
+        }
+        if block_ids:
+            data['blocks'] = [
+                {
+                    'block_id': block_id,
+                    'download_url': f'/api/v1/models/download/{token}/block/{block_id}/'
+                }
+                for block_id in block_ids
+            ]
+        if serializer.validated_data['signed_urls']:
+            data['signed_blocks'] = signed_blocks(
+                model, user, download_record.expires_at, manifests.get(model.id, []), set(block_ids)
+            )
+        results.append(data)
+    
+    return Response({'downloads': results})
+
+def get_download_record(request, download_token):
+    """Get active download record for token, or an error response"""
     try:
-        download_record = ModelDownload.objects.get(
+        download_record = ModelDownload.objects.select_related('model').get(
             download_token=download_token,
             user=request.user,
-            is_completed=False
+            is_completed=False,
+            expires_at__gt=timezone.now()
         )
     except ModelDownload.DoesNotExist:
-        return Response({'error': 'Invalid or expired download token'}, status=status.HTTP_404_NOT_FOUND)
+        return None, Response({'error': 'Invalid or expired download token'}, status=status.HTTP_404_NOT_FOUND)
     
-    # Check if token is not too old (1 hour)
-    if (timezone.now() - download_record.started_at).seconds > 3600:
-        return Response({'error': 'Download token expired'}, status=status.HTTP_410_GONE)
+    return download_record, None
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def download_model(request, download_token):
+    """Download model using secure token"""
+    download_record, error = get_download_record(request, download_token)
+    if error:
+        return error
     
     model = download_record.model
     
-    # For MVP, return model metadata and block information
-    # In production, this would serve actual model files
-    return Response({
-        'model_name': model.name,
-        'display_name': model.display_name,
-        'version': model.version,
-        'block_count': model.block_count,
-        'file_size': model.file_size,
-        'blocks': [
+    # Per-block manifest lets clients verify blocks and skip ones they have
+    manifest = list(model.blocks.filter(version=model.version))
+    return Response(manifest_data(model, manifest, download_token))
+
+def manifest_data(model, manifest, download_token):
+    """Build the download manifest of a model from its block rows"""
+    if manifest:
+        blocks = [
+            {
+                'block_id': block.block_index,
+                'filename': block.filename,
+                'size': block.size,
+                'sha256': block.sha256,
+                'download_url': f'/api/v1/models/download/{download_token}/block/{block.block_index}/'
+            }
+            for block in manifest
+        ]
+    else:
+        blocks = [
             {
                 'block_id': i + 1,
                 'filename': f'block_{i + 1}.onnx',
                 'download_url': f'/api/v1/models/download/{download_token}/block/{i + 1}/'
             }
             for i in range(model.block_count)
-        ],
+        ]
+    
+    return {
+        'model_name': model.name,
+        'display_name': model.display_name,
+        'version': model.version,
+        'block_count': model.block_count,
+        'file_size': model.file_size,
+        'blocks': blocks,
         'tokenizer': {
             'download_url': f'/api/v1/models/download/{download_token}/tokenizer/'
         },
         'metadata': {
             'download_url': f'/api/v1/models/download/{download_token}/metadata/'
-        }
-    })
+        },
+        'transfer_plan': transfer_plan(manifest)
+    }
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def download_block(request, download_token, block_id):
+    """Stream a single model block, supporting ranged and resumed downloads"""
+    download_record, error = get_download_record(request, download_token)
+    if error:
+        return error
+    
+    model = download_record.model
+    if not 1 <= block_id <= model.block_count:
+        return Response({'error': 'Block not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    block = ModelBlock.objects.filter(
+        model=model, version=model.version, block_index=block_id
+    ).first()
+    
+    # Parallel ranged downloads are limited per token
+    slot = acquire_connection(download_token)
+    if slot is None:
+        return too_many_connections()
+    response = ranged_file_response(request, *block_file(model, block, block_id))
+    if response is None:
+        release_connection(slot)
+        return Response({'error': 'Block file not available'}, status=status.HTTP_404_NOT_FOUND)
+    return release_on_close(response, slot)
+
+def too_many_connections():
+    """Response for a download already using all of its connections"""
+    return Response(
+        {'error': 'Too many concurrent connections for this download'},
+        status=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={'Retry-After': '1'}
+    )
+
+def block_file(model, block, block_id):
+    """Get path and ETag of a block, from its manifest row when there is one"""
+    if block:
+        return storage_file(block.storage_path), quote_etag(block.sha256)
+    return block_path(model, block_id), None
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def download_signed_block(request, model_name, block_id):
+    """Stream a model block authorized by a signed URL instead of a token lookup"""
+    sha256, error = verify_block_signature(model_name, block_id, request.GET)
+    if error == 'expired':
+        return Response({'error': 'Download URL expired'}, status=status.HTTP_410_GONE)
+    if error or model_name not in dict(ModelFile.MODEL_TYPES):
+        return Response({'error': 'Invalid download signature'}, status=status.HTTP_403_FORBIDDEN)
+    
+    # Signed URLs issued for one download token share its expiry
+    slot = acquire_connection(f'signed:{model_name}:{request.GET.get("user", "")}:{request.GET["expires"]}')
+    if slot is None:
+        return too_many_connections()
+    if sha256:
+        response = ranged_file_response(
+            request, storage_file(object_storage_path(sha256)), etag=quote_etag(sha256)
+        )
+    else:
+        response = ranged_file_response(
+            request, block_path(ModelFile(name=model_name), block_id)
+        )
+    if response is None:
+        release_connection(slot)
+        return Response({'error': 'Block file not available'}, status=status.HTTP_404_NOT_FOUND)
+    return release_on_close(response, slot)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def download_tokenizer(request, download_token):
+    """Stream model tokenizer file"""
+    download_record, error = get_download_record(request, download_token)
+    if error:
+        return error
+    
+    response = ranged_file_response(
+        request, tokenizer_path(download_record.model), content_type='application/json'
+    )
+    if response is None:
+        return Response({'error': 'Tokenizer file not available'}, status=status.HTTP_404_NOT_FOUND)
+    return response
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def download_metadata(request, download_token):
+    """Stream model metadata file"""
+    download_record, error = get_download_record(request, download_token)
+    if error:
+        return error
+    
+    response = ranged_file_response(
+        request, metadata_path(download_record.model), content_type='application/json'
+    )
+    if response is None:
+        return Response({'error': 'Metadata file not available'}, status=status.HTTP_404_NOT_FOUND)
+    return response
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -132,6 +414,37 @@ def model_metadata(request, model_id):
     """Get model metadata without downloading"""
     user = request.user
     
+    version = get_catalog_version()
+    key = catalog_key('metadata', model_id)
+    etag = catalog_etag(version, key)
+    
+    def build():
+        model = ModelFile.objects.get(id=model_id, is_active=True)
+        return ModelFileSerializer(model).data, {'name': model.name}
+    
+    try:
+        entry = get_catalog_entry(version, key, build)
+    except ModelFile.DoesNotExist:
+        return Response({'error': 'Model not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    # Check access
+    allowed_models = user.get_allowed_models()
+    if entry['name'] not in allowed_models:
+        return Response({'error': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
+    
+    if not_modified(request, etag):
+        return catalog_response(b'', etag, status=status.HTTP_304_NOT_MODIFIED)
+    return catalog_response(entry['body'], etag)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def model_delta(request, model_id):
+    """Get blocks that changed since a previous model version"""
+    user = request.user
+    from_version = request.GET.get('from_version')
+    if not from_version:
+        return Response({'error': 'from_version is required'}, status=status.HTTP_400_BAD_REQUEST)
+    
     try:
         model = ModelFile.objects.get(id=model_id, is_active=True)
     except ModelFile.DoesNotExist:
@@ -142,7 +455,34 @@ def model_metadata(request, model_id):
     if model.name not in allowed_models:
         return Response({'error': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
     
-    return Response(ModelFileSerializer(model).data)
+    previous = {
+        block.block_index: block.sha256
+        for block in model.blocks.filter(version=from_version)
+    }
+    if not previous:
+        return Response({'error': 'Unknown from_version'}, status=status.HTTP_404_NOT_FOUND)
+    
+    current = list(model.blocks.filter(version=model.version))
+    changed = [block for block in current if previous.get(block.block_index) != block.sha256]
+    current_indexes = {block.block_index for block in current}
+    
+    return Response({
+        'model_name': model.name,
+        'from_version': from_version,
+        'to_version': model.version,
+        'block_count': len(current),
+        'changed_blocks': [
+            {
+                'block_id': block.block_index,
+                'filename': block.filename,
+                'size': block.size,
+                'sha256': block.sha256,
+            }
+            for block in changed
+        ],
+        'removed_blocks': sorted(set(previous) - current_indexes),
+        'download_size': sum(block.size for block in changed),
+    })
 
 def get_client_ip(request):
     """Get client IP address from request"""
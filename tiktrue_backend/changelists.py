@@ -0,0 +1,81 @@
+import json
+from django.conf import settings
+from django.contrib.admin.utils import get_fields_from_path
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+def estimate_count(queryset):
+    """
+    Estimate the row count of a queryset from PostgreSQL statistics.
+
+    Unfiltered querysets use reltuples of the table and its partitions,
+    filtered ones the planner's row estimate. Returns None on other
+    databases or when the table has never been analyzed.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                'SELECT SUM(reltuples), MIN(reltuples) FROM pg_class '
+                'WHERE oid = %s::regclass OR oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = %s::regclass)',
+                [queryset.model._meta.db_table] * 2
+            )
+            total, minimum = cursor.fetchone()
+            # reltuples is -1 until the table is first analyzed
+            if total is None or minimum < 0:
+                return None
+            return int(total)
+
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that estimates large counts instead of running COUNT(*).
+
+    Counts estimated below ADMIN_ESTIMATED_COUNT_THRESHOLD are computed
+    exactly, so small tables and narrow filters still page precisely.
+    """
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate is None or estimate < settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+            return super().count
+        return estimate
+
+class LargeTableAdminMixin:
+    """
+    Changelist settings for tables with millions of rows.
+
+    Counts are estimated and the unfiltered total is not computed. Fields in
+    exact_search_fields are matched by equality first, so a search for a
+    token or IP address uses their index instead of scanning with LIKE.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    exact_search_fields = []
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        for path in self.exact_search_fields if term else []:
+            # Skip terms the column cannot hold, e.g. non-IPs for inet
+            field = get_fields_from_path(queryset.model, path)[-1]
+            try:
+                value = field.to_python(term)
+                field.run_validators(value)
+            except ValidationError:
+                continue
+            matches = queryset.filter(**{path: value})
+            if matches.exists():
+                return matches, False
+        return super().get_search_results(request, queryset, search_term)
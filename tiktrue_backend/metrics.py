@@ -0,0 +1,97 @@
+"""
+In-process request metrics exposed in Prometheus text format.
+
+Each worker process keeps its own registry, so scrape every worker (or
+run a single worker per container) to see the full picture.
+"""
+
+import hmac
+import threading
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_http_methods
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+HISTOGRAMS = {
+    'duration': ('tiktrue_http_request_duration_seconds', 'Wall time spent handling the request', DURATION_BUCKETS),
+    'queries': ('tiktrue_http_request_db_queries', 'Database queries made by the request', QUERY_BUCKETS),
+    'db_time': ('tiktrue_http_request_db_duration_seconds', 'Time spent in database queries', DURATION_BUCKETS),
+    'size': ('tiktrue_http_response_size_bytes', 'Serialized response body size', SIZE_BUCKETS),
+}
+
+class Histogram:
+    """Cumulative histogram with Prometheus-style buckets"""
+    
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0
+    
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+
+class MetricsRegistry:
+    """Per-route request metrics"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._requests = {}
+    
+    def observe(self, route, method, status_code, duration, queries, db_time, size):
+        values = {'duration': duration, 'queries': queries, 'db_time': db_time, 'size': size}
+        with self._lock:
+            for name, value in values.items():
+                key = (name, route, method)
+                if key not in self._histograms:
+                    self._histograms[key] = Histogram(HISTOGRAMS[name][2])
+                self._histograms[key].observe(value)
+            key = (route, method, status_code)
+            self._requests[key] = self._requests.get(key, 0) + 1
+    
+    def render(self):
+        """Render all metrics in Prometheus text exposition format"""
+        lines = [
+            '# HELP tiktrue_http_requests_total Requests handled',
+            '# TYPE tiktrue_http_requests_total counter',
+        ]
+        with self._lock:
+            for (route, method, status_code), count in sorted(self._requests.items()):
+                lines.append(
+                    f'tiktrue_http_requests_total{{route="{route}",method="{method}",status="{status_code}"}} {count}'
+                )
+            for name, (metric, help_text, buckets) in HISTOGRAMS.items():
+                lines.append(f'# HELP {metric} {help_text}')
+                lines.append(f'# TYPE {metric} histogram')
+                for (key_name, route, method), histogram in sorted(self._histograms.items()):
+                    if key_name != name:
+                        continue
+                    labels = f'route="{route}",method="{method}"'
+                    for bound, count in zip(buckets, histogram.counts):
+                        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                    lines.append(f'{metric}_sum{{{labels}}} {histogram.sum}')
+                    lines.append(f'{metric}_count{{{labels}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+registry = MetricsRegistry()
+
+@require_http_methods(["GET"])
+def metrics(request):
+    """Prometheus metrics endpoint, closed unless METRICS_TOKEN is set or DEBUG is on"""
+    token = settings.METRICS_TOKEN
+    if token:
+        authorization = request.META.get('HTTP_AUTHORIZATION', '')
+        if not hmac.compare_digest(authorization.encode(), f'Bearer {token}'.encode()):
+            return HttpResponseForbidden()
+    elif not settings.DEBUG:
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4')
@@ -0,0 +1,69 @@
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connection
+from .metrics import registry
+
+class QueryStats:
+    """Database execute wrapper counting queries and their duration"""
+    
+    def __init__(self):
+        self.count = 0
+        self.time = 0
+    
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.time += time.perf_counter() - start
+            self.count += 1
+
+class RequestMetricsMiddleware:
+    """
+    Record wall time, query count, DB time and response size per request.
+
+    Queries are counted with connection.execute_wrapper, so DEBUG does not
+    need to be on. Results are added as a Server-Timing header and exported
+    through the /metrics/ endpoint.
+    """
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = QueryStats()
+        start = time.perf_counter()
+        with connection.execute_wrapper(stats):
+            response = self.get_response(request)
+        return self.record(request, response, stats, time.perf_counter() - start)
+    
+    async def __acall__(self, request):
+        stats = QueryStats()
+        start = time.perf_counter()
+        with connection.execute_wrapper(stats):
+            response = await self.get_response(request)
+        return self.record(request, response, stats, time.perf_counter() - start)
+    
+    def record(self, request, response, stats, duration):
+        """Export the request's measurements and add the Server-Timing header"""
+        if response.streaming:
+            size = int(response.get('Content-Length') or 0)
+        else:
+            size = len(response.content)
+        
+        match = request.resolver_match
+        route = match.route if match else 'unmatched'
+        registry.observe(route, request.method, response.status_code, duration, stats.count, stats.time, size)
+        
+        response['Server-Timing'] = (
+            f'app;dur={duration * 1000:.1f}, '
+            f'db;dur={stats.time * 1000:.1f};desc="{stats.count} queries"'
+        )
+        return response
@@ -0,0 +1,44 @@
+from django.db.migrations.operations import AddIndex
+
+class AddIndexConcurrently(AddIndex):
+    """
+    AddIndex that builds the index CONCURRENTLY on PostgreSQL.
+
+    Large audit tables keep accepting writes while the index builds.
+    Partitioned tables cannot be indexed concurrently and are indexed
+    normally. Indexes marked postgres_only (e.g. with operator classes) are
+    skipped on other databases. Migrations using it must set atomic = False.
+    """
+
+    def __init__(self, model_name, index, postgres_only=False):
+        super().__init__(model_name, index)
+        self.postgres_only = postgres_only
+
+    def deconstruct(self):
+        name, args, kwargs = super().deconstruct()
+        if self.postgres_only:
+            kwargs['postgres_only'] = True
+        return name, args, kwargs
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if schema_editor.connection.vendor == 'postgresql':
+            schema_editor.add_index(model, self.index, concurrently=not self.is_partitioned(schema_editor, model))
+        elif not self.postgres_only:
+            schema_editor.add_index(model, self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if schema_editor.connection.vendor == 'postgresql':
+            schema_editor.remove_index(model, self.index, concurrently=not self.is_partitioned(schema_editor, model))
+        elif not self.postgres_only:
+            schema_editor.remove_index(model, self.index)
+
+    def is_partitioned(self, schema_editor, model):
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute('SELECT relkind FROM pg_class WHERE oid = %s::regclass', [model._meta.db_table])
+            return cursor.fetchone()[0] == 'p'
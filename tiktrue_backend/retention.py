@@ -0,0 +1,36 @@
+import time
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import TruncDate
+
+def rollup_batches(queryset, time_field, key_field, daily_model, counts, batch_size, sleep=0):
+    """
+    Roll raw audit rows up into a daily table and delete them in batches.
+
+    Each batch takes the oldest batch_size rows of queryset, adds their
+    per-(key_field, day) counts to daily_model and deletes them in one
+    transaction, so locks stay short and an interrupted run loses nothing.
+    counts maps daily_model fields to aggregate expressions.
+    Returns the number of rows rolled up.
+    """
+    model = queryset.model
+    total = 0
+    while True:
+        with transaction.atomic():
+            ids = list(queryset.order_by(time_field).values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            batch = model.objects.filter(pk__in=ids)
+            groups = batch.annotate(date=TruncDate(time_field)).values(key_field, 'date').annotate(**counts).order_by()
+            for group in groups:
+                key = {key_field: group[key_field], 'date': group['date']}
+                updated = daily_model.objects.filter(**key).update(
+                    **{field: F(field) + group[field] for field in counts}
+                )
+                if not updated:
+                    daily_model.objects.create(**key, **{field: group[field] for field in counts})
+            batch.delete()
+        total += len(ids)
+        if sleep:
+            time.sleep(sleep)
+    return total
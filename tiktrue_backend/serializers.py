@@ -0,0 +1,6 @@
+from rest_framework import serializers
+
+# Hot read endpoints build their responses from .values() rows or model
+# instances with plain functions instead of ModelSerializers, which set up
+# field objects per call. They render datetimes through this shared field.
+datetime_field = serializers.DateTimeField()
@@ -38,6 +38,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'tiktrue_backend.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -51,6 +52,13 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'tiktrue_backend.urls'
 
+# Route downloads and license validation to async views; enable when serving
+# tiktrue_backend.asgi with an ASGI server such as uvicorn
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', 'False').lower() == 'true'
+
+# Bearer token required to read /metrics/ (only open with DEBUG when unset)
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -68,14 +76,28 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'tiktrue_backend.wsgi.application'
+ASGI_APPLICATION = 'tiktrue_backend.asgi.application'
 
 # Database
+# Keep connections open between requests (seconds, 0 closes after each
+# request). Async views do not reuse connections, so ASGI deployments
+# default to 0 and should pool through pgbouncer instead.
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', 0 if ASYNC_VIEWS else 600))
+# pgbouncer in transaction pooling mode cannot keep server-side cursors
+# open between transactions
+DB_PGBOUNCER = os.environ.get('DB_PGBOUNCER', 'False').lower() == 'true'
+
 if os.environ.get('DATABASE_URL'):
     # Production database (PostgreSQL on Liara)
     import dj_database_url
     DATABASES = {
-        'default': dj_database_url.parse(os.environ.get('DATABASE_URL'))
+        'default': dj_database_url.parse(
+            os.environ.get('DATABASE_URL'),
+            conn_max_age=DB_CONN_MAX_AGE,
+            conn_health_checks=DB_CONN_MAX_AGE > 0,
+        )
     }
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = DB_PGBOUNCER
 else:
     # Development database (SQLite)
     DATABASES = {
@@ -85,6 +107,22 @@ else:
         }
     }
 
+# Cache
+# Set REDIS_URL to share the cache (and catalog invalidation) between workers
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -101,6 +139,25 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing: PASSWORD_HASHER picks the hasher for new and upgraded
+# hashes, the others stay listed so existing hashes keep verifying
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'pbkdf2')
+PASSWORD_HASHERS = [
+    'accounts.hashers.TunedPBKDF2PasswordHasher',
+    'accounts.hashers.TunedArgon2PasswordHasher',
+    'accounts.hashers.TunedBCryptSHA256PasswordHasher',
+]
+PASSWORD_HASHERS.sort(key=lambda path: PASSWORD_HASHER.lower() not in path.lower())
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get('PASSWORD_PBKDF2_ITERATIONS', 600000))
+PASSWORD_ARGON2_TIME_COST = int(os.environ.get('PASSWORD_ARGON2_TIME_COST', 2))
+PASSWORD_ARGON2_MEMORY_COST = int(os.environ.get('PASSWORD_ARGON2_MEMORY_COST', 102400))
+PASSWORD_ARGON2_PARALLELISM = int(os.environ.get('PASSWORD_ARGON2_PARALLELISM', 8))
+PASSWORD_BCRYPT_ROUNDS = int(os.environ.get('PASSWORD_BCRYPT_ROUNDS', 12))
+
+# Admin changelists of tables estimated above this many rows show an
+# estimated count (PostgreSQL statistics) instead of running COUNT(*)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(os.environ.get('ADMIN_ESTIMATED_COUNT_THRESHOLD', 100000))
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'Asia/Tehran'
@@ -116,30 +173,108 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Model storage settings
+MODEL_STORAGE_ROOT = Path(os.environ.get('MODEL_STORAGE_ROOT', MEDIA_ROOT / 'models'))
+MODEL_DOWNLOAD_CHUNK_SIZE = int(os.environ.get('MODEL_DOWNLOAD_CHUNK_SIZE', 1024 * 1024))
+MODEL_DOWNLOAD_TOKEN_TTL = int(os.environ.get('MODEL_DOWNLOAD_TOKEN_TTL', 3600))
+# HMAC key for signed block URLs; share it with a proxy that validates them.
+# There is no default: it must never be SECRET_KEY (see models_api/checks.py)
+MODEL_URL_SIGNING_KEY = os.environ.get('MODEL_URL_SIGNING_KEY', '')
+# 'stream' (chunked through Django), 'sendfile' (wsgi.file_wrapper),
+# 'x-accel-redirect' (nginx) or 'x-sendfile' (Apache/lighttpd)
+MODEL_DOWNLOAD_DELIVERY = os.environ.get('MODEL_DOWNLOAD_DELIVERY', 'stream').lower()
+MODEL_ACCEL_REDIRECT_PREFIX = os.environ.get('MODEL_ACCEL_REDIRECT_PREFIX', '/protected-models/')
+# Download manifests split blocks into segments of this many bytes for
+# parallel ranged downloads; setup_models --hash-blocks hashes each segment
+MODEL_TRANSFER_SEGMENT_SIZE = int(os.environ.get('MODEL_TRANSFER_SEGMENT_SIZE', 64 * 1024 * 1024))
+# Concurrent block connections allowed per download token, 0 for no limit
+MODEL_TRANSFER_MAX_CONNECTIONS = int(os.environ.get('MODEL_TRANSFER_MAX_CONNECTIONS', 4))
+# Connection counters are kept per fixed window of this many seconds, so
+# slots leaked by killed workers are freed when the window ends. Connections
+# opened in the previous window are forgotten, so up to twice the cap can be
+# open just after a boundary
+MODEL_TRANSFER_CONNECTION_TIMEOUT = int(os.environ.get('MODEL_TRANSFER_CONNECTION_TIMEOUT', 600))
+# Cached model catalog responses are also invalidated when a ModelFile changes
+MODEL_CATALOG_CACHE_TIMEOUT = int(os.environ.get('MODEL_CATALOG_CACHE_TIMEOUT', 300))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # orjson when installed, DRF's stdlib encoder otherwise
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'tiktrue_backend.renderers.FastJSONRenderer',
     ],
+    # Reverse proxies in front of the app (Liara's ingress is one); throttles
+    # trust only the X-Forwarded-For entries these proxies appended
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 1)),
+    # Token bucket sizes: 'N/period' allows bursts of N, refilled over the period
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': os.environ.get('THROTTLE_LOGIN_IP', '30/min'),
+        'login_email': os.environ.get('THROTTLE_LOGIN_EMAIL', '5/min'),
+        'register_ip': os.environ.get('THROTTLE_REGISTER_IP', '10/hour'),
+    },
 }
 
+# Where throttle buckets live: 'local' (per worker) or 'cache' (shared)
+THROTTLE_BACKEND = os.environ.get('THROTTLE_BACKEND', 'cache' if os.environ.get('REDIS_URL') else 'local')
+
+# Cached user lookups for JWT authentication; the shared tier needs REDIS_URL,
+# as a per-process cache would miss invalidations from other workers
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get('AUTH_USER_CACHE_TIMEOUT', 60 if os.environ.get('REDIS_URL') else 0))
+AUTH_USER_CACHE_LOCAL_TIMEOUT = int(os.environ.get('AUTH_USER_CACHE_LOCAL_TIMEOUT', 5))
+AUTH_USER_CACHE_SIZE = int(os.environ.get('AUTH_USER_CACHE_SIZE', 10000))
+
 # JWT settings
 from datetime import timedelta
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=24),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=30),
     'ROTATE_REFRESH_TOKENS': True,
+    # Rotated refresh tokens are revoked through accounts.revocation
+    'BLACKLIST_AFTER_ROTATION': True,
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.serializers.TokenRefreshSerializer',
 }
 
+# Refresh token revocation: a per-process Bloom filter over RevokedToken,
+# synced with other workers every TOKEN_REVOCATION_SYNC_SECONDS
+TOKEN_REVOCATION_BLOOM_CAPACITY = int(os.environ.get('TOKEN_REVOCATION_BLOOM_CAPACITY', 1000000))
+TOKEN_REVOCATION_BLOOM_ERROR_RATE = float(os.environ.get('TOKEN_REVOCATION_BLOOM_ERROR_RATE', 0.001))
+TOKEN_REVOCATION_SYNC_SECONDS = int(os.environ.get('TOKEN_REVOCATION_SYNC_SECONDS', 5))
+TOKEN_REVOCATION_SYNC_OVERLAP = 60
+TOKEN_REVOCATION_REBUILD_SECONDS = int(os.environ.get('TOKEN_REVOCATION_REBUILD_SECONDS', 3600))
+
+# License validation audit log
+# Validation events are written in batches by a background thread; at most
+# LICENSE_AUDIT_MAX_PENDING events per worker can be lost if it crashes
+LICENSE_AUDIT_BUFFERED = os.environ.get('LICENSE_AUDIT_BUFFERED', 'True').lower() == 'true'
+LICENSE_AUDIT_BATCH_SIZE = int(os.environ.get('LICENSE_AUDIT_BATCH_SIZE', 100))
+LICENSE_AUDIT_FLUSH_INTERVAL_MS = int(os.environ.get('LICENSE_AUDIT_FLUSH_INTERVAL_MS', 1000))
+LICENSE_AUDIT_MAX_PENDING = int(os.environ.get('LICENSE_AUDIT_MAX_PENDING', 1000))
+# Aggregate license usage_count increments in memory and apply them on flush
+LICENSE_USAGE_BUFFERED = os.environ.get('LICENSE_USAGE_BUFFERED', 'False').lower() == 'true'
+
+# Audit retention
+# rollup_audit keeps raw validation and download rows for this many days
+AUDIT_RETENTION_DAYS = int(os.environ.get('AUDIT_RETENTION_DAYS', 90))
+AUDIT_RETENTION_BATCH_SIZE = int(os.environ.get('AUDIT_RETENTION_BATCH_SIZE', 5000))
+
+# Offline license assertions
+# Signed with an Ed25519 private key (PEM) so clients verify them with the
+# public key only. There is no default: the key must never be SECRET_KEY or
+# any other secret the desktop app would have to ship (see licenses/checks.py)
+LICENSE_ASSERTION_ALGORITHM = os.environ.get('LICENSE_ASSERTION_ALGORITHM', 'EdDSA')
+LICENSE_ASSERTION_SIGNING_KEY = os.environ.get('LICENSE_ASSERTION_SIGNING_KEY', '').replace('\\n', '\n')
+LICENSE_ASSERTION_LIFETIME = timedelta(hours=int(os.environ.get('LICENSE_ASSERTION_LIFETIME_HOURS', 72)))
+LICENSE_REVOCATION_LIST_CACHE_TIMEOUT = int(os.environ.get('LICENSE_REVOCATION_LIST_CACHE_TIMEOUT', 60))
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = os.environ.get('CORS_ALLOWED_ORIGINS', 'http://localhost:3000,http://127.0.0.1:3000').split(',') + [
     "https://tiktrue.com",
@@ -6,6 +6,7 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from .setup_views import setup_database, health_check
+from .metrics import metrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -15,6 +16,7 @@ urlpatterns = [
     # Setup endpoints
     path('setup/database/', setup_database, name='setup_database'),
     path('health/', health_check, name='health_check'),
+    path('metrics/', metrics, name='metrics'),
 ]
 
 # Serve media files in development